@@ -1,44 +1,135 @@
 import math
 import heapq
 import time
+from functools import lru_cache
+import board
+import symmetry
+from board import dimensions, format_board, goal_state
+from bucket_queue import BucketQueue
+from indexed_heap import IndexedHeap
+from packed_state import MoveMap, board_for
 cols = 3
 rows = 3
 goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
 
-def A_Star(start,heuristic):
+def A_Star(start,heuristic,progress=None,indexed=False,stats=None,buckets=False,instrument=None):
+    # Open-list entries are (F, H, State): on equal F the state with the lower H
+    # (higher G, closer to the goal) is expanded first. A state is closed when
+    # popped; with heapq, older entries for it are then skipped as stale. A
+    # closed state reached again by a strictly shorter path is reopened, which
+    # only happens with an inconsistent heuristic and keeps A* optimal for any
+    # admissible one. With
+    # indexed=True the open list is an IndexedHeap and a cheaper path lowers
+    # the queued entry in place (decrease-key), so there are no stale entries.
+    # buckets=True uses a BucketQueue indexed by (F, H) instead, which needs an
+    # integer-valued heuristic (Manhattan, pattern databases).
+    # If stats is a dict, 'stale_pops', 'reopened' and 'heap_peak' are stored in it.
+    # instrument (see instrumentation.py) is told about every expansion.
+    if indexed and buckets:
+        raise ValueError("choose either indexed or buckets for the open list")
+    # Mirror-image boards have mirrored solutions: search the canonical one
+    canonical, mirrored = symmetry.canonical(start)
+    if mirrored:
+        result = A_Star(canonical, heuristic, progress, indexed, stats, buckets, instrument)
+        if result is None:
+            return None
+        Parent, expanded, cost, search_depth = result
+        return symmetry.TransposedMap(Parent), expanded, cost, search_depth
+    if instrument is not None:
+        heuristic = instrument.timed(heuristic)
+    # Board size comes from the start state (3x3, 4x4, ...)
+    packed = board_for(start)
+    goal = goal_state(packed.cols, packed.rows)
+    moves = packed.moves
+    # Heuristics with a tile_distance are updated from the tile that moved (see tile_table)
+    table = tile_table(heuristic, goal)
     Parent={}
     expanded=0
     search_depth=0
+    stale_pops=0
+    reopened=0
+    heap_peak=1
+    if stats is None:
+        stats = {}
+    stats['stale_pops'] = 0
+    stats['reopened'] = 0
+    stats['heap_peak'] = 0
     if start == goal:
         print("Reach Goal")
-        return Parent,expanded,0,0
-    frontier = [] # {F(State):Statue}
-    visited = set() # Keep visited state
-    g_n=[] # {State : G(State)}
-    heapq.heappush(frontier, (0, start))
-    Parent[tuple(start)]=None
-    g_n = {tuple(start): 0} # G(n) for the start is 0 
+        return MoveMap({packed.pack(start): None}, board=packed),expanded,0,0
+    s = packed.pack(start)
+    target = packed.pack(goal)
+    visited = set() # Closed states
+    h_start = heuristic(start, goal)
+    if indexed:
+        frontier = IndexedHeap()
+        frontier.push(s, (h_start, h_start, s))
+    elif buckets:
+        if not isinstance(h_start, int):
+            raise ValueError("the bucket open list needs an integer-valued heuristic")
+        frontier = BucketQueue()
+        frontier.push(s, h_start, h_start)
+    else:
+        frontier = [(h_start, h_start, s)] # (F, H, State)
+    Parent[s]=None
+    g_n = {s: 0} # G(n) for the start is 0 
     while frontier :
-        f, v = heapq.heappop(frontier) # POP the Min F(n)
-        visited.add(tuple(v)) # Add this State to visited list
+        if indexed:
+            v, (f, h, _) = frontier.pop()
+        else:
+            if buckets:
+                v, f, h = frontier.pop()
+            else:
+                f, h, v = heapq.heappop(frontier) # POP the Min F(n)
+            if v in visited: # Stale entry: v was queued again with a lower G and already expanded
+                stale_pops+=1
+                continue
+        visited.add(v) # Add this State to visited list
         expanded+=1
-        search_depth=max(search_depth,g_n[tuple(v)])
-        if v==goal:  # Check if this the goal
+        search_depth=max(search_depth,g_n[v])
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, len(frontier), search_depth)
+        if instrument is not None:
+            instrument.expand(g_n[v], len(frontier))
+            known = len(g_n)
+        if v==target:  # Check if this the goal
             print("reach goal")
-            return Parent,expanded,g_n[tuple(v)],search_depth
-        for neighbour in getNeighbours(v): # Go through neighbours of Currnt State . 
-            t=tuple(neighbour)
-            if t not in visited:         
-                g_neighbour=g_n[tuple(v)]+1   # G(neighbour) is the G(parent)+1
-                if t not in g_n or g_n[t]>g_neighbour: # Add this check to prevent unneccassary states in heap        
-                   h_neighbour=heuristic(neighbour,goal)   
-                   f=h_neighbour+g_neighbour
-                   Parent[t]=v
-                   heapq.heappush(frontier, (f, neighbour))
-                   g_n[t]=g_neighbour
+            stats['stale_pops'] = stale_pops
+            stats['reopened'] = reopened
+            stats['heap_peak'] = heap_peak
+            return MoveMap(Parent, board=packed),expanded,g_n[v],search_depth
+        children = moves(v)
+        for neighbour, tile, source, dest in children: # Go through neighbours of Currnt State . 
+            g_neighbour=g_n[v]+1   # G(neighbour) is the G(parent)+1
+            if neighbour not in g_n or g_n[neighbour]>g_neighbour: # Add this check to prevent unneccassary states in heap        
+               if neighbour in visited: # Closed with a longer path: reopen it
+                   visited.remove(neighbour)
+                   reopened+=1
+               if table is not None:
+                   h_neighbour=h+table[tile][dest]-table[tile][source]
+               else:
+                   h_neighbour=heuristic(packed.unpack(neighbour),goal)
+               f=h_neighbour+g_neighbour
+               Parent[neighbour]=dest # blank index of v: the move is recovered from it
+               if indexed:
+                   frontier.push(neighbour, (f, h_neighbour, neighbour)) # decrease-key if already queued
+               elif buckets:
+                   frontier.push(neighbour, f, h_neighbour)
+               else:
+                   heapq.heappush(frontier, (f, h_neighbour, neighbour))
+               g_n[neighbour]=g_neighbour
+        if instrument is not None:
+            instrument.generate(len(children), len(children) - (len(g_n) - known))
+        if len(frontier) > heap_peak:
+            heap_peak = len(frontier)
+    stats['stale_pops'] = stale_pops
+    stats['reopened'] = reopened
+    stats['heap_peak'] = heap_peak
     print ("No Solution Found !!!!!!!!!!!!! ")
 
 def manhattan_distance(current, goal):
+    cols, rows = dimensions(goal)
     h=0
     for i, tile in enumerate(current):
         if tile != 0: 
@@ -50,6 +141,7 @@ def manhattan_distance(current, goal):
 
 
 def euclidean_distance(current, goal):
+    cols, rows = dimensions(goal)
     h=0
     for i, tile in enumerate(current):
         if tile != 0: 
@@ -60,29 +152,45 @@ def euclidean_distance(current, goal):
 
     return h
 
+@lru_cache(maxsize=None)
+def tile_distance_table(distance, goal):
+    """Per-tile heuristic terms: table[tile][pos] = distance(dx, dy) between
+    pos and the tile's position in goal (0 for the blank).
+    """
+    cols, rows = dimensions(goal)
+    table = [[0] * (cols * rows) for _ in range(cols * rows)]
+    for tile in range(1, cols * rows):
+        goal_x, goal_y = divmod(goal.index(tile), cols)
+        for pos in range(cols * rows):
+            x, y = divmod(pos, cols)
+            table[tile][pos] = distance(x - goal_x, y - goal_y)
+    return table
+
+
+def tile_table(heuristic, goal):
+    """The per-tile table of heuristic for boards like goal, or None.
+
+    A heuristic that is a sum of per-tile terms can expose its term as a
+    tile_distance(dx, dy) attribute; A_Star then gets a child's h from the
+    parent's h by swapping the one term of the tile that moved, instead of
+    calling the heuristic on the whole board.
+    """
+    distance = getattr(heuristic, "tile_distance", None)
+    if distance is None:
+        return None
+    return tile_distance_table(distance, tuple(goal))
+
+
+manhattan_distance.tile_distance = lambda dx, dy: abs(dx) + abs(dy)
+euclidean_distance.tile_distance = lambda dx, dy: math.sqrt(dx ** 2 + dy ** 2)
+
 def valid(i, j):
     return i >= 0 and i < rows and j >= 0 and j < cols
 
 
 def getNeighbours(v: list):
-    indexOfZero = v.index(0)
-    i, j = divmod(indexOfZero, cols)
-    neighbours = []
-    
-    dx = [-1, 1, 0, 0]
-    dy = [0, 0, -1, 1]
-    
-    for k in range(4):
-        new_i = i + dx[k]
-        new_j = j + dy[k]
-        
-        if valid(new_i, new_j):
-            new_index = new_i * cols + new_j
-            new_state = v.copy()
-            new_state[indexOfZero], new_state[new_index] = new_state[new_index], new_state[indexOfZero]
-            neighbours.append(new_state)
-    
-    return neighbours
+    packed = board_for(v)
+    return [packed.unpack(neighbour) for neighbour in packed.neighbours(packed.pack(v))]
 
 def printPath(Parent, goal):
     path = []
@@ -98,35 +206,64 @@ def printPath(Parent, goal):
 
 
 def printPuzzle(state):
-    for i in range(rows):
-        print(state[i*cols:(i+1)*cols])
+    for row in format_board(state):
+        print(row)
 
 def is_solvable(puzzle):
-    # If number of Inversions is odd -> unsolvable
-    inv_count = 0
-    arr = [x for x in puzzle if x != 0]  # ignore the blank
-    for i in range(len(arr)):
-        for j in range(i + 1, len(arr)):
-            if arr[i] > arr[j]:
-                inv_count += 1
-    return inv_count % 2 == 0 
-
-# start = [8, 1, 2, 0, 4, 3, 7, 6, 5]
-# start = [1, 2, 5, 3, 4, 0, 6, 7, 8]
-start = [1, 0, 2 ,7, 5, 4, 8, 6, 3]
-# start = [1, 2, 3 ,4, 5, 6, 8, 7, 0]
-# start = [6, 4, 7 ,8, 5, 0, 3, 2, 1]
-# start = [8, 6, 7 ,2, 5, 4, 3, 0, 1]
-start_time = time.time()
-
-if is_solvable(start):
-    parent_manhattan, expanded_manhattan,cost_path,search_depth = A_Star(start, manhattan_distance)
-    printPath(parent_manhattan, goal)
-    print(f"cost of path : {cost_path} , nodes expanded = {expanded_manhattan} ,search depth = {search_depth}")
-
-  #  parent_euclidean, expanded_euclidean = A_Star(start, euclidean_distance)
-   
-else:
-    print("This puzzle is unsolvable!")
-end_time = time.time()  
-print(f"Execution time: {end_time - start_time:.4f} seconds")
+    # Inversion parity (plus blank row on even widths) -> see board.is_solvable
+    return board.is_solvable(puzzle)
+
+
+def _blank_on_even(current, goal):
+    # Admissible but not consistent: Manhattan distance only when the blank is
+    # on an even cell, so a single move can drop h by the whole distance
+    return manhattan_distance(current, goal) if current.index(0) % 2 == 0 else 0
+
+
+def check():
+    """Solve boards whose optimal lengths are known with every open list;
+    returns the number of (board, heuristic, open list) runs that failed."""
+    import contextlib
+    import io
+    from pattern_database import PDB_3_5, PDB_4_4
+
+    cases = [([7, 2, 1, 6, 4, 3, 8, 0, 5], PDB_4_4, 21),
+             ([7, 2, 1, 6, 4, 3, 8, 0, 5], PDB_3_5, 21),
+             ([5, 2, 3, 1, 8, 7, 0, 6, 4], _blank_on_even, 20)]
+    failures = 0
+    for start, heuristic, optimal in cases:
+        for name, options in (("heapq", {}), ("indexed", {'indexed': True}), ("buckets", {'buckets': True})):
+            with contextlib.redirect_stdout(io.StringIO()):
+                parent, _, cost, _ = A_Star(start, heuristic, **options)
+            moves = parent.moves_to(goal_state(3))
+            if cost != optimal or len(moves) != optimal or board.apply_moves(start, moves)[-1] != goal_state(3):
+                failures += 1
+                print(f"{start} {getattr(heuristic, '__name__', heuristic)} {name}: "
+                      f"{cost} moves, expected {optimal}")
+    return failures
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["check"]:
+        sys.exit(1 if check() else 0)
+    # start = [8, 1, 2, 0, 4, 3, 7, 6, 5]
+    # start = [1, 2, 5, 3, 4, 0, 6, 7, 8]
+    start = [1, 0, 2 ,7, 5, 4, 8, 6, 3]
+    # start = [1, 2, 3 ,4, 5, 6, 8, 7, 0]
+    # start = [6, 4, 7 ,8, 5, 0, 3, 2, 1]
+    # start = [8, 6, 7 ,2, 5, 4, 3, 0, 1]
+    start_time = time.time()
+
+    if is_solvable(start):
+        parent_manhattan, expanded_manhattan,cost_path,search_depth = A_Star(start, manhattan_distance)
+        printPath(parent_manhattan, goal)
+        print(f"cost of path : {cost_path} , nodes expanded = {expanded_manhattan} ,search depth = {search_depth}")
+
+        # parent_euclidean, expanded_euclidean = A_Star(start, euclidean_distance)
+
+    else:
+        print("This puzzle is unsolvable!")
+    end_time = time.time()  
+    print(f"Execution time: {end_time - start_time:.4f} seconds")
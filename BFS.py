@@ -1,67 +1,146 @@
-from queue import Queue
 import time
+import board
+import symmetry
+from board import format_board, goal_state
+from packed_state import MoveMap, board_for
 cols = 3
 rows = 3
 goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-def BFS(start: list):
-    Parent={}
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+def BFS(start: list, progress=None, instrument=None):
+    # Mirror-image boards have mirrored solutions: search the canonical one
+    canonical, mirrored = symmetry.canonical(start)
+    if mirrored:
+        result = BFS(canonical, progress, instrument)
+        if result is None:
+            return None
+        Parent, expanded, cost, search_depth = result
+        return symmetry.TransposedMap(Parent), expanded, cost, search_depth
+    # Board size comes from the start state (3x3, 4x4, ...)
+    packed = board_for(start)
+    goal = goal_state(packed.cols, packed.rows)
+    neighbours = packed.neighbours
+    blank_mask = packed.blank_mask
     expanded=0
-    search_depth=0
-    g_n=[]
     if start == goal:
 
         print("Reach Goal")
-        return Parent,expanded,0,0
+        return MoveMap({packed.pack(start): None}, board=packed),expanded,0,0
     
-    frontier = Queue()
-    frontier.put(start)
-    visited = set() 
-    g_n = {tuple(start): 0} 
-    Parent[tuple(start)]=None
-    visited.add(tuple(start))
-    while not frontier.empty():
-        v = frontier.get()
-        search_depth=max(search_depth,g_n[tuple(v)])
-        expanded+=1
-        if v == goal:
+    s = packed.pack(start)
+    target = packed.pack(goal)
+    # Level-synchronous search: every state in `frontier` is `depth` moves from
+    # start, so no per-state depth is stored. Parent[v] is the blank index of
+    # v's parent (None for start); it doubles as the visited set.
+    Parent = {s: None}
+    frontier = [s]
+    depth = 0
+    while frontier:
+        next_frontier = []
+        for i, v in enumerate(frontier):
+            expanded+=1
+            if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+                progress(expanded, len(frontier) - i + len(next_frontier), depth)
+            if instrument is not None:
+                instrument.expand(depth, len(frontier) - i + len(next_frontier))
+                known = len(Parent)
+            if v == target:
+                print("Reach Goal")
+                return MoveMap(Parent, board=packed),expanded,depth,depth
+            
+            blank = v & blank_mask
+            children = neighbours(v)
+            for neighbour in children:
+                if neighbour not in Parent:
+                    Parent[neighbour]=blank
+                    next_frontier.append(neighbour)
+            if instrument is not None:
+                instrument.generate(len(children), len(children) - (len(Parent) - known))
+        frontier = next_frontier
+        depth += 1
+    
+    print("No solution found !!!!!!!!!!!!!!!!")
+
+
+def Bidirectional_BFS(start: list, progress=None):
+    """Breadth-first search from start and from goal until the two meet.
+
+    Each round expands one whole level of the side with the smaller
+    frontier. Returns (Parent, expanded, cost, depth) like BFS(); Parent only
+    holds the states on the solution path, and depth is the deeper of the
+    two searches.
+    """
+    packed = board_for(start)
+    goal = goal_state(packed.cols, packed.rows)
+    neighbours = packed.neighbours
+    blank_mask = packed.blank_mask
+    s = packed.pack(start)
+    target = packed.pack(goal)
+    if s == target:
+        print("Reach Goal")
+        return MoveMap({s: None}, board=packed),0,0,0
+    
+    # Per side: {state: blank index of its parent}, frontier, depth of frontier
+    parents = [{s: None}, {target: None}]
+    frontiers = [[s], [target]]
+    depths = [0, 0]
+    expanded=0
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = parents[side], parents[1 - side]
+        frontier = frontiers[side]
+        next_frontier = []
+        best = None
+        for i, v in enumerate(frontier):
+            expanded+=1
+            if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+                progress(expanded, len(frontier) - i + len(next_frontier) + len(frontiers[1 - side]),
+                         depths[0] + depths[1])
+            
+            blank = v & blank_mask
+            for neighbour in neighbours(v):
+                if neighbour not in mine:
+                    mine[neighbour]=blank
+                    next_frontier.append(neighbour)
+                    if neighbour in other:
+                        cost = depths[side] + 1 + _chain_length(packed, other, neighbour)
+                        if best is None or cost < best[0]:
+                            best = (cost, neighbour)
+        frontiers[side] = next_frontier
+        depths[side] += 1
+        if best is not None:
+            # Every match is found while finishing this level, so the cheapest one is optimal
+            cost, meet = best
+            path = _chain(packed, parents[0], meet)[::-1] + _chain(packed, parents[1], meet)[1:]
+            Parent = {path[0]: None}
+            for previous, state in zip(path, path[1:]):
+                Parent[state] = previous & blank_mask
             print("Reach Goal")
-            return Parent,expanded,g_n[tuple(v)],search_depth
-       
-        
-        for neighbour in getNeighbours(v):
-            t = tuple(neighbour)
-            if t not in visited:
-                g_n[t]=g_n[tuple(v)]+1 
-                Parent[t]=v
-                frontier.put(neighbour)
-                visited.add(t)
+            return MoveMap(Parent, board=packed),expanded,cost,max(depths)
     
     print("No solution found !!!!!!!!!!!!!!!!")
 
 
+def _chain(packed, parents, v):
+    # States from v back to the root of a {state: parent blank index} map
+    chain = [v]
+    while parents[v] is not None:
+        v = packed.slide(v, parents[v])
+        chain.append(v)
+    return chain
+
+
+def _chain_length(packed, parents, v):
+    return len(_chain(packed, parents, v)) - 1
+
+
 def valid(i, j):
     return i >= 0 and i < rows and j >= 0 and j < cols
 
 
 def getNeighbours(v: list):
-    indexOfZero = v.index(0)
-    i, j = divmod(indexOfZero, cols)
-    neighbours = []
-    
-    dx = [-1, 1, 0, 0]
-    dy = [0, 0, -1, 1]
-    
-    for k in range(4):
-        new_i = i + dx[k]
-        new_j = j + dy[k]
-        
-        if valid(new_i, new_j):
-            new_index = new_i * cols + new_j
-            new_state = v.copy()
-            new_state[indexOfZero], new_state[new_index] = new_state[new_index], new_state[indexOfZero]
-            neighbours.append(new_state)
-    
-    return neighbours
+    packed = board_for(v)
+    return [packed.unpack(neighbour) for neighbour in packed.neighbours(packed.pack(v))]
 
 def printPath(Parent, goal):
     path = []
@@ -77,33 +156,30 @@ def printPath(Parent, goal):
 
 
 def printPuzzle(state):
-    for i in range(rows):
-        print(state[i*cols:(i+1)*cols])
+    for row in format_board(state):
+        print(row)
 
 def is_solvable(puzzle):
-    inv_count = 0
-    arr = [x for x in puzzle if x != 0]  # ignore the blank
-    for i in range(len(arr)):
-        for j in range(i + 1, len(arr)):
-            if arr[i] > arr[j]:
-                inv_count += 1
-    return inv_count % 2 == 0
-
-
-# start = [8, 1, 2, 0, 4, 3, 7, 6, 5]
-# start = [1, 2, 5, 3, 4, 0, 6, 7, 8]
-start = [1, 0, 2 ,7, 5, 4, 8, 6, 3]
-# start = [1, 2, 3 ,4, 5, 6, 8, 7, 0]
-# start = [6, 4, 7 ,8, 5, 0, 3, 2, 1]
-# start = [8, 6, 7 ,2, 5, 4, 3, 0, 1]
-
-start_time = time.time()
-if is_solvable(start):
-    Parent, expanded, cost_path, search_depth = BFS(start)
-    printPath(Parent, goal)
-    print(f"Cost of path: {cost_path}, Nodes expanded: {expanded}, Search depth: {search_depth}")
-else:
-    print("This puzzle is unsolvable!")
-
-end_time = time.time()  
-print(f"Execution time: {end_time - start_time:.4f} seconds")
\ No newline at end of file
+    return board.is_solvable(puzzle)
+
+
+if __name__ == "__main__":
+    # start = [8, 1, 2, 0, 4, 3, 7, 6, 5]
+    # start = [1, 2, 5, 3, 4, 0, 6, 7, 8]
+    start = [1, 0, 2 ,7, 5, 4, 8, 6, 3]
+    # start = [1, 2, 3 ,4, 5, 6, 8, 7, 0]
+    # start = [6, 4, 7 ,8, 5, 0, 3, 2, 1]
+    # start = [8, 6, 7 ,2, 5, 4, 3, 0, 1]
+
+    start_time = time.time()
+    if is_solvable(start):
+        Parent, expanded, cost_path, search_depth = BFS(start)
+        printPath(Parent, goal)
+        print(f"Cost of path: {cost_path}, Nodes expanded: {expanded}, Search depth: {search_depth}")
+        Parent, expanded, cost_path, search_depth = Bidirectional_BFS(start)
+        print(f"Bidirectional: cost of path: {cost_path}, Nodes expanded: {expanded}, Search depth: {search_depth}")
+    else:
+        print("This puzzle is unsolvable!")
+
+    end_time = time.time()  
+    print(f"Execution time: {end_time - start_time:.4f} seconds")
@@ -1,25 +1,43 @@
-import copy
+import board
+from board import format_board, goal_state
+from packed_state import MoveMap, board_for
 
-def DfS(arr):
-    stack = [(arr, 0)]
-    visited = {tuple(arr)} 
-    parent = {}
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+
+
+def DfS(arr, progress=None, instrument=None):
+    # Board size comes from the start state (3x3, 4x4, ...)
+    packed = board_for(arr)
+    neighbours = packed.neighbours
+    blank_mask = packed.blank_mask
+    target = packed.pack(goal_state(packed.cols, packed.rows))
+    start = packed.pack(arr)
+    stack = [(start, 0)]
+    visited = {start}
+    parent = {}  # state -> blank index of its parent
     expanded = 0
     max_search_depth = 0
     
     while stack:
         node, depth = stack.pop()
-        key = tuple(node)
         expanded += 1
         max_search_depth = max(max_search_depth, depth)
-        if Isgoal(node):
-            return node, parent, expanded, max_search_depth 
-        for neighbour in getneighbours(node):
-            nkey = tuple(neighbour)
-            if nkey not in visited:
-                visited.add(nkey)
-                parent[nkey] = key
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, len(stack), depth)
+        if instrument is not None:
+            instrument.expand(depth, len(stack))
+            known = len(visited)
+        if node == target:
+            return packed.unpack(node), MoveMap(parent, tuple, packed), expanded, max_search_depth 
+        blank = node & blank_mask
+        children = neighbours(node)
+        for neighbour in children:
+            if neighbour not in visited:
+                visited.add(neighbour)
+                parent[neighbour] = blank
                 stack.append((neighbour, depth + 1))
+        if instrument is not None:
+            instrument.generate(len(children), len(children) - (len(visited) - known))
                 
     return None, None, expanded, max_search_depth
 
@@ -35,38 +53,12 @@ def calculate_solution_depth(goal, parent):  # Better name
 
 
 def getneighbours(arr):
-    neighbours = []
-    index = arr.index(0)
-    i, j = divmod(index, 3)
-
-    if i - 1 >= 0:  # up
-        a = arr.copy()
-        ni = (i - 1) * 3 + j
-        a[index], a[ni] = a[ni], a[index]
-        neighbours.append(a)
-    if i + 1 <= 2:  # down
-        a = arr.copy()
-        ni = (i + 1) * 3 + j
-        a[index], a[ni] = a[ni], a[index]
-        neighbours.append(a)
-    if j - 1 >= 0:  # left
-        a = arr.copy()
-        nj = i * 3 + (j - 1)
-        a[index], a[nj] = a[nj], a[index]
-        neighbours.append(a)
-    if j + 1 <= 2:  # right
-        a = arr.copy()
-        nj = i * 3 + (j + 1)
-        a[index], a[nj] = a[nj], a[index]
-        neighbours.append(a)
-    return neighbours
+    packed = board_for(arr)
+    return [packed.unpack(neighbour) for neighbour in packed.neighbours(packed.pack(arr))]
 
 
 def Isgoal(arr):
-    goal = [0, 1, 2,
-            3, 4, 5,
-            6, 7, 8]
-    return arr == goal
+    return list(arr) == goal_state(*board.dimensions(arr))
 
 
 def print_path(goal, parent):
@@ -81,18 +73,23 @@ def print_path(goal, parent):
     print("\nPath from start to goal:")
     for step, state in enumerate(path):
         print(f"\nStep {step}:")
-        for i in range(0, 9, 3):
-            print(state[i:i+3])
+        for row in format_board(state):
+            print(row)
     return step
 
 
 def checkinstances(arr):
-    # Exclude 0 from inversion count
-    filtered = [x for x in arr if x != 0]
-    num = 0
-    for i in range(len(filtered)):
-        for j in range(i+1, len(filtered)):
-            if filtered[i] > filtered[j]:
-                num += 1
-    return num % 2 == 0
+    # Inversion parity, plus the blank's row on even widths
+    return board.is_solvable(arr)
+
+
+
+if __name__ == "__main__":
+    start = [1, 0, 2, 7, 5, 4, 8, 6, 3]
 
+    if checkinstances(start):
+        goal, parent, expanded, max_search_depth = DfS(start)
+        print_path(goal, parent)
+        print(f"Cost of path: {calculate_solution_depth(goal, parent)}, Nodes expanded: {expanded}, Search depth: {max_search_depth}")
+    else:
+        print("This puzzle is unsolvable!")
@@ -1,11 +1,11 @@
 """
 8-Puzzle Solver GUI - Nature/Game Theme (CLEAN VERSION)
 Improved DFS/IDFS handling, removed subtitle and solution field
+The board size (3x3, 4x4 or 5x5) is picked in the header
 """
 
+import os
 import sys
-import time
-import random
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QGridLayout, QPushButton, QLabel, 
                              QTabWidget, QComboBox, QTextEdit, 
@@ -15,10 +15,56 @@ from PyQt5.QtCore import Qt, QTimer, QSize
 from PyQt5.QtGui import QFont
 
 # Import algorithm modules
-from BFS import BFS, is_solvable as bfs_solvable
-from DFS import DfS, checkinstances as dfs_solvable, calculate_solution_depth
+from BFS import BFS, Bidirectional_BFS, is_solvable as bfs_solvable
+from DFS import DfS, checkinstances as dfs_solvable
 from IDFS import IDFS, checkinstances as idfs_solvable
+from IDA_star import IDA_Star
+from parallel_ida import Parallel_IDA_Star, Parallel_IDFS
+from SMA_star import SMA_Star
 from A_star import A_Star, manhattan_distance, euclidean_distance, is_solvable as astar_solvable
+import state_database
+import solve
+from board import apply_move, apply_moves, dimensions, goal_state, path_moves
+from instances import random_solvable_state
+from instrumentation import Instrument
+from pattern_database import PDB_4_4, PDB_3_5, PDB_15_4_4_4_3
+from search_worker import SearchWorker
+from solution_cache import SolutionCache, DEFAULT_PATH as SOLUTION_CACHE_PATH
+
+HEURISTICS = {
+    "Manhattan": manhattan_distance,
+    "Euclidean": euclidean_distance,
+    "Pattern DB 4-4": PDB_4_4,
+    "Pattern DB 3-5": PDB_3_5,
+    "Pattern DB 4-4-4-3 (15-puzzle)": PDB_15_4_4_4_3,
+}
+
+# Pattern database used by IDA* for each board size (cells)
+PATTERN_DATABASES = {9: PDB_4_4, 16: PDB_15_4_4_4_3}
+
+BOARD_SIZES = {"3 x 3": 3, "4 x 4": 4, "5 x 5": 5}
+
+# A* node budget: None runs plain A*, a number runs SMA* with that many nodes
+MEMORY_LIMITS = {
+    "Unbounded (A*)": None,
+    "100,000 nodes (SMA*)": 100000,
+    "20,000 nodes (SMA*)": 20000,
+    "2,000 nodes (SMA*)": 2000,
+}
+
+# Processes for the IDFS tab's root-split search; 1 runs the serial solvers
+WORKER_COUNTS = {"1 (serial)": 1}
+WORKER_COUNTS.update({f"{n} processes": n for n in (2, 4, 8, 16, 32) if n <= (os.cpu_count() or 1)})
+
+
+def heuristic_key(heuristic):
+    """Name of a heuristic in solve.HEURISTICS, used in solution cache keys"""
+    return next((name for name, h in solve.HEURISTICS.items() if h is heuristic), repr(heuristic))
+
+
+def heuristic_fits(heuristic, state):
+    """Pattern databases only work on the board size they were built for"""
+    return getattr(heuristic, 'size', len(state)) == len(state)
 
 
 class WoodenTile(QPushButton):
@@ -36,11 +82,11 @@ class WoodenTile(QPushButton):
         ('#2ecc71', '#27ae60'),  # Green (8)
     ]
     
-    def __init__(self, value=0):
+    def __init__(self, value=0, size=90):
         super().__init__()
         self.value = value
-        self.setFixedSize(90, 90)
-        self.setFont(QFont("Arial Black", 32, QFont.Bold))
+        self.setFixedSize(size, size)
+        self.setFont(QFont("Arial Black", size * 32 // 90, QFont.Bold))
         self.setCursor(Qt.PointingHandCursor if value != 0 else Qt.ArrowCursor)
         self.update_style()
     
@@ -63,7 +109,8 @@ class WoodenTile(QPushButton):
             """)
         else:
             self.setText(str(self.value))
-            color1, color2 = self.COLORS[self.value]
+            # Tiles past 8 reuse the palette
+            color1, color2 = self.COLORS[1 + (self.value - 1) % (len(self.COLORS) - 1)]
             self.setStyleSheet(f"""
                 QPushButton {{
                     background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
@@ -102,6 +149,7 @@ class GamePuzzleBoard(QWidget):
         super().__init__()
         self.current_state = [0, 1, 2, 3, 4, 5, 6, 7, 8]
         self.tiles = []
+        self.grid = None
         self.init_ui()
     
     def init_ui(self):
@@ -115,17 +163,11 @@ class GamePuzzleBoard(QWidget):
         panel_layout.setContentsMargins(20, 20, 20, 20)
         
         # Grid for tiles
-        grid = QGridLayout()
-        grid.setSpacing(10)
-        
-        # Create 9 tiles in a 3x3 grid
-        for i in range(9):
-            tile = WoodenTile(i)
-            self.tiles.append(tile)
-            row, col = divmod(i, 3)
-            grid.addWidget(tile, row, col)
+        self.grid = QGridLayout()
+        self.grid.setSpacing(10)
+        self.build_tiles(len(self.current_state))
         
-        panel_layout.addLayout(grid)
+        panel_layout.addLayout(self.grid)
         panel.setLayout(panel_layout)
         
         main_layout.addWidget(panel)
@@ -133,6 +175,21 @@ class GamePuzzleBoard(QWidget):
         
         self.update_display()
     
+    def build_tiles(self, count):
+        """(Re)create the tiles for a square board of count cells"""
+        for tile in self.tiles:
+            self.grid.removeWidget(tile)
+            tile.deleteLater()
+        self.tiles = []
+        
+        cols, rows = dimensions(range(count))
+        tile_size = max(50, 270 // cols)
+        for i in range(count):
+            tile = WoodenTile(i, tile_size)
+            self.tiles.append(tile)
+            row, col = divmod(i, cols)
+            self.grid.addWidget(tile, row, col)
+    
     def update_display(self):
         """Update the visual display based on current state"""
         for i, value in enumerate(self.current_state):
@@ -141,6 +198,8 @@ class GamePuzzleBoard(QWidget):
     def set_state(self, state):
         """Set the board to a specific state"""
         self.current_state = state.copy() if isinstance(state, list) else list(state)
+        if len(self.current_state) != len(self.tiles):
+            self.build_tiles(len(self.current_state))
         self.update_display()
 
 
@@ -196,7 +255,7 @@ class NatureButton(QPushButton):
 
 
 class CompactInputGrid(QWidget):
-    """Compact 3x3 input grid for puzzle state"""
+    """Compact input grid for puzzle state, one field per cell"""
     
     def __init__(self):
         super().__init__()
@@ -206,14 +265,25 @@ class CompactInputGrid(QWidget):
     def init_ui(self):
         layout = QGridLayout()
         layout.setSpacing(5)
+        self.setLayout(layout)
+        self.build_inputs(9)
+    
+    def build_inputs(self, count):
+        """(Re)create the input fields for a square board of count cells"""
+        layout = self.layout()
+        for input_field in self.inputs:
+            layout.removeWidget(input_field)
+            input_field.deleteLater()
+        self.inputs = []
         
-        for i in range(9):
+        cols, rows = dimensions(range(count))
+        for i in range(count):
             input_field = QLineEdit()
             input_field.setFixedSize(40, 40)
             input_field.setAlignment(Qt.AlignCenter)
-            input_field.setFont(QFont("Arial Black", 13, QFont.Bold))
+            input_field.setFont(QFont("Arial Black", 13 if count <= 10 else 11, QFont.Bold))
             input_field.setText(str(i))
-            input_field.setMaxLength(1)
+            input_field.setMaxLength(len(str(count - 1)))
             input_field.setStyleSheet("""
                 QLineEdit {
                     background: #FFF8DC;
@@ -226,10 +296,8 @@ class CompactInputGrid(QWidget):
                 }
             """)
             self.inputs.append(input_field)
-            row, col = divmod(i, 3)
+            row, col = divmod(i, cols)
             layout.addWidget(input_field, row, col)
-        
-        self.setLayout(layout)
     
     def get_state(self):
         """Get current state from inputs"""
@@ -237,6 +305,8 @@ class CompactInputGrid(QWidget):
     
     def set_state(self, state):
         """Set input values"""
+        if len(state) != len(self.inputs):
+            self.build_inputs(len(state))
         for i, value in enumerate(state):
             self.inputs[i].setText(str(value))
 
@@ -275,7 +345,13 @@ class StatsPanel(QFrame):
             ('path', '🎯 Path to Goal'),
             ('cost', '💰 Cost of Path'),
             ('expanded', '🔍 Nodes Expanded'),
+            ('frontier', '🌿 Frontier Size'),
+            ('generated', '🌱 Generated / Duplicates'),
             ('depth', '📏 Search Depth'),
+            ('peak', '🧠 Peak Nodes'),
+            ('regenerated', '♻️ Regenerations'),
+            ('utilization', '⚡ Cores Busy'),
+            ('memory', '💾 Peak Memory'),
             ('time', '⏱️ Running Time')
         ]
         
@@ -298,9 +374,24 @@ class StatsPanel(QFrame):
         self.stats_labels['path'].setText(f"🎯 Path to Goal: {stats.get('cost', '-')} moves")
         self.stats_labels['cost'].setText(f"💰 Cost of Path: {stats.get('cost', '-')}")
         self.stats_labels['expanded'].setText(f"🔍 Nodes Expanded: {stats.get('expanded', '-')}")
+        self.stats_labels['frontier'].setText(f"🌿 Frontier Size: {stats.get('frontier', '-')}")
+        generated = f"{stats['generated']} / {stats['duplicates']}" if 'generated' in stats else '-'
+        self.stats_labels['generated'].setText(f"🌱 Generated / Duplicates: {generated}")
         self.stats_labels['depth'].setText(f"📏 Search Depth: {stats.get('depth', '-')}")
+        self.stats_labels['peak'].setText(f"🧠 Peak Nodes: {stats.get('peak', '-')}")
+        self.stats_labels['regenerated'].setText(f"♻️ Regenerations: {stats.get('regenerated', '-')}")
+        utilization = f"{stats['utilization']:.2f}" if 'utilization' in stats else '-'
+        self.stats_labels['utilization'].setText(f"⚡ Cores Busy: {utilization}")
+        memory = f"{stats['memory_peak'] / 1e6:.1f} MB" if stats.get('memory_peak') is not None else '-'
+        self.stats_labels['memory'].setText(f"💾 Peak Memory: {memory}")
         self.stats_labels['time'].setText(f"⏱️ Running Time: {stats.get('time', '-'):.4f}s")
     
+    def update_progress(self, expanded, frontier, depth):
+        """Show live numbers from a running search"""
+        self.stats_labels['expanded'].setText(f"🔍 Nodes Expanded: {expanded}")
+        self.stats_labels['frontier'].setText(f"🌿 Frontier Size: {frontier}")
+        self.stats_labels['depth'].setText(f"📏 Search Depth: {depth}")
+    
     def clear_stats(self):
         """Clear all statistics"""
         for key in self.stats_labels:
@@ -319,9 +410,12 @@ class AlgorithmTab(QWidget):
         self.stats_panel = StatsPanel()
         self.animation_timer = QTimer()
         self.animation_timer.timeout.connect(self.animate_step)
-        self.solution_path = []
+        self.solution_moves = ""  # move string being replayed (see board.MOVE_LETTERS)
         self.current_step = 0
         self.is_animating = False
+        self.worker = None
+        self.cache_key = None  # (algorithm, heuristic) of the search being run
+        self.instrument = None  # Instrument of the search being run, if it takes one
         self.init_ui()
     
     def init_ui(self):
@@ -395,9 +489,17 @@ class AlgorithmTab(QWidget):
         right_panel.addWidget(input_frame)
         
         # Control buttons
+        run_layout = QHBoxLayout()
         self.run_btn = NatureButton("▶ START", 'green')
         self.run_btn.clicked.connect(self.run_algorithm)
-        right_panel.addWidget(self.run_btn)
+        
+        self.cancel_btn = NatureButton("■ CANCEL", 'pink')
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_search)
+        
+        run_layout.addWidget(self.run_btn)
+        run_layout.addWidget(self.cancel_btn)
+        right_panel.addLayout(run_layout)
         
         control_layout = QHBoxLayout()
         self.step_btn = NatureButton("⏯ STEP", 'orange')
@@ -483,8 +585,8 @@ class AlgorithmTab(QWidget):
         try:
             state = self.input_grid.get_state()
             
-            if sorted(state) != list(range(9)):
-                raise ValueError("State must contain all values from 0 to 8")
+            if sorted(state) != goal_state(*dimensions(state)):
+                raise ValueError(f"State must contain all values from 0 to {len(state) - 1}")
             
             self.puzzle_board.set_state(state)
             
@@ -498,11 +600,7 @@ class AlgorithmTab(QWidget):
     
     def randomize_state(self):
         """Generate a random solvable state"""
-        while True:
-            state = list(range(9))
-            random.shuffle(state)
-            if self.check_solvable(state):
-                break
+        state = random_solvable_state(*dimensions(self.puzzle_board.current_state))
         
         self.input_grid.set_state(state)
         self.puzzle_board.set_state(state)
@@ -518,9 +616,10 @@ class AlgorithmTab(QWidget):
     
     def reset_board(self):
         """Reset the board to the initial state from input grid"""
+        self.cancel_search()
         initial_state = self.input_grid.get_state()
         self.puzzle_board.set_state(initial_state)
-        self.solution_path = []
+        self.solution_moves = ""
         self.current_step = 0
         self.animation_timer.stop()
         self.is_animating = False
@@ -531,9 +630,67 @@ class AlgorithmTab(QWidget):
         """Run the algorithm (to be overridden)"""
         pass
     
-    def animate_solution(self, path):
-        """Start animating the solution path"""
-        self.solution_path = path
+    def show_cached_solution(self, algorithm, heuristic, start_state):
+        """Show a cached solution for start_state; returns True if there was one"""
+        self.cache_key = (algorithm, heuristic)
+        self.instrument = None
+        cache = getattr(self.window(), 'solution_cache', None)
+        cached = cache.get(algorithm, heuristic, start_state) if cache is not None else None
+        if cached is None:
+            return False
+        
+        path, stats = cached
+        self.clear_output()
+        self.display_stats(stats)
+        self.animate_solution(path[0], path_moves(path))
+        print(f"{self.algorithm_name}: answered from the solution cache ({len(path) - 1} moves)")
+        return True
+    
+    def new_instrument(self):
+        """Instrument for the search about to start; its counters are shown with the result"""
+        self.instrument = Instrument()
+        return self.instrument
+    
+    def remember_solution(self, start, moves, stats):
+        """Add a finished search to the shared solution cache"""
+        cache = getattr(self.window(), 'solution_cache', None)
+        if cache is not None and self.cache_key is not None:
+            cache.put(*self.cache_key, apply_moves(start, moves), stats)
+    
+    def start_search(self, job, on_result):
+        """Run job(progress) on a background thread, then call on_result(result, elapsed)"""
+        self.clear_output()
+        self.run_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        
+        self.worker = SearchWorker(job, parent=self)
+        self.worker.progress.connect(self.stats_panel.update_progress)
+        self.worker.succeeded.connect(on_result)
+        self.worker.failed.connect(lambda message: QMessageBox.critical(self, "Error", f"Error: {message}"))
+        self.worker.cancelled.connect(self.on_search_cancelled)
+        self.worker.finished.connect(self.on_search_finished)
+        self.worker.start()
+    
+    def cancel_search(self):
+        """Ask the running search (if any) to stop"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+    
+    def on_search_cancelled(self):
+        self.clear_output()
+        print(f"{self.algorithm_name}: search cancelled")
+    
+    def on_search_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        self.run_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+    
+    def animate_solution(self, start, moves):
+        """Start replaying a move string from start"""
+        self.puzzle_board.set_state(list(start))
+        self.solution_moves = moves
         self.current_step = 0
         self.step_btn.setEnabled(True)
         self.is_animating = True
@@ -542,12 +699,16 @@ class AlgorithmTab(QWidget):
         delay = int(1000 / speed)
         self.animation_timer.start(delay)
     
+    def play_move(self):
+        """Apply the next move of the solution to the board"""
+        move = self.solution_moves[self.current_step]
+        self.puzzle_board.set_state(apply_move(self.puzzle_board.current_state, move))
+        self.current_step += 1
+    
     def animate_step(self):
         """Animate one step of the solution"""
-        if self.current_step < len(self.solution_path):
-            state = self.solution_path[self.current_step]
-            self.puzzle_board.set_state(state)
-            self.current_step += 1
+        if self.current_step < len(self.solution_moves):
+            self.play_move()
         else:
             self.animation_timer.stop()
             self.is_animating = False
@@ -556,15 +717,73 @@ class AlgorithmTab(QWidget):
     def step_forward(self):
         """Manually step forward one move"""
         self.animation_timer.stop()
-        if self.current_step < len(self.solution_path):
-            state = self.solution_path[self.current_step]
-            self.puzzle_board.set_state(state)
-            self.current_step += 1
-            if self.current_step >= len(self.solution_path):
+        if self.current_step < len(self.solution_moves):
+            self.play_move()
+            if self.current_step >= len(self.solution_moves):
                 self.step_btn.setEnabled(False)
     
+    def add_option_selector(self, title, items):
+        """Add a titled combo box under the input section and return it"""
+        # Find the right panel layout
+        right_scroll = self.layout().itemAt(1).widget()
+        if isinstance(right_scroll, QScrollArea):
+            right_widget = right_scroll.widget()
+            right_layout = right_widget.layout()
+            
+            # Create selector frame
+            option_frame = WoodenPanel()
+            h_layout = QVBoxLayout()
+            h_layout.setContentsMargins(12, 12, 12, 12)
+            
+            h_label = QLabel(title)
+            h_label.setFont(QFont("Arial Black", 10, QFont.Bold))
+            h_label.setStyleSheet("color: #FFD700;")
+            h_label.setAlignment(Qt.AlignCenter)
+            h_layout.addWidget(h_label)
+            
+            combo = QComboBox()
+            combo.addItems(items)
+            combo.setFont(QFont("Arial", 9, QFont.Bold))
+            combo.setStyleSheet("""
+                QComboBox {
+                    background: #FFF8DC;
+                    border: 3px solid #8B6F47;
+                    border-radius: 8px;
+                    padding: 6px;
+                    color: #3E2723;
+                }
+                QComboBox:hover {
+                    border: 3px solid #D4AF37;
+                }
+                QComboBox::drop-down {
+                    border: none;
+                }
+                QComboBox::down-arrow {
+                    image: none;
+                    border-left: 5px solid transparent;
+                    border-right: 5px solid transparent;
+                    border-top: 5px solid #8B6F47;
+                    margin-right: 6px;
+                }
+                QComboBox QAbstractItemView {
+                    background: #FFF8DC;
+                    border: 3px solid #8B6F47;
+                    selection-background-color: #D4AF37;
+                    selection-color: #3E2723;
+                }
+            """)
+            h_layout.addWidget(combo)
+            
+            option_frame.setLayout(h_layout)
+            
+            # Insert after input frame (position 1)
+            right_layout.insertWidget(1, option_frame)
+            return combo
+    
     def display_stats(self, stats):
-        """Display algorithm statistics"""
+        """Display algorithm statistics, with the search's instrument counters if it had one"""
+        if self.instrument is not None:
+            stats = {**self.instrument.record(), **stats}
         self.stats_panel.update_stats(stats)
     
     def clear_output(self):
@@ -575,6 +794,7 @@ class AlgorithmTab(QWidget):
 class BFSTab(AlgorithmTab):
     def __init__(self):
         super().__init__("Breadth-First Search", 'blue')
+        self.engine_combo = self.add_option_selector("🧭 ENGINE", ["Breadth-First Search", "Bidirectional BFS"])
     
     def check_solvable(self, state):
         return bfs_solvable(state)
@@ -592,40 +812,41 @@ class BFSTab(AlgorithmTab):
         if hasattr(parent_window, 'shared_state'):
             parent_window.shared_state = start_state
         
-        self.clear_output()
-        self.run_btn.setEnabled(False)
-        start_time = time.time()
+        algorithm = "bfs" if self.engine_combo.currentIndex() == 0 else "bibfs"
+        if self.show_cached_solution(algorithm, None, start_state):
+            return
         
+        engine_name = self.engine_combo.currentText()
+        if self.engine_combo.currentIndex() == 0:
+            instrument = self.new_instrument()
+            job = lambda progress: BFS(start_state, progress=progress, instrument=instrument)
+        else:
+            job = lambda progress: Bidirectional_BFS(start_state, progress=progress)
+        self.start_search(job, lambda result, elapsed: self.show_result(result, elapsed, engine_name, start_state))
+    
+    def show_result(self, result, elapsed, engine_name, start):
         try:
-            parent, expanded, cost, depth = BFS(start_state)
-            end_time = time.time()
+            parent, expanded, cost, depth = result
             
-            goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-            path = []
-            current = goal
-            while current is not None:
-                path.append(current)
-                current = parent[tuple(current)]
-            path.reverse()
+            moves = parent.moves_to(goal_state(*dimensions(start)))
             
-            stats = {'cost': cost, 'expanded': expanded, 'depth': depth, 'time': end_time - start_time}
+            stats = {'cost': cost, 'expanded': expanded, 'depth': depth, 'time': elapsed}
             self.display_stats(stats)
-            self.animate_solution(path)
+            self.remember_solution(start, moves, stats)
+            self.animate_solution(start, moves)
             
             print("\n" + "="*50)
-            print("BFS Algorithm Results")
+            print(f"{engine_name} Results")
             print("="*50)
-            print(f"Path to Goal: {len(path) - 1} moves")
+            print(f"Path to Goal: {len(moves)} moves ({moves})")
             print(f"Cost of Path: {cost}")
             print(f"Nodes Expanded: {expanded}")
             print(f"Search Depth: {depth}")
-            print(f"Running Time: {end_time - start_time:.4f} seconds")
+            print(f"Running Time: {elapsed:.4f} seconds")
             print("="*50 + "\n")
-            
+
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
-        finally:
-            self.run_btn.setEnabled(True)
 
 
 class DFSTab(AlgorithmTab):
@@ -648,57 +869,60 @@ class DFSTab(AlgorithmTab):
         if hasattr(parent_window, 'shared_state'):
             parent_window.shared_state = start_state
         
-        self.clear_output()
-        self.run_btn.setEnabled(False)
-        start_time = time.time()
+        if self.show_cached_solution("dfs", None, start_state):
+            return
         
+        instrument = self.new_instrument()
+        self.start_search(lambda progress: DfS(start_state, progress=progress, instrument=instrument),
+                          lambda result, elapsed: self.show_result(result, elapsed, start_state))
+    
+    def show_result(self, result, elapsed, start):
         try:
-            goal, parent, expanded, max_depth = DfS(start_state)
-            end_time = time.time()
+            goal, parent, expanded, max_depth = result
             
             if goal is None:
                 QMessageBox.warning(self, "No Solution", "No solution found!")
-                self.run_btn.setEnabled(True)
                 return
             
-            # Build path from parent dictionary
-            path = []
-            key = tuple(goal)
-            while key in parent:
-                path.append(list(key))
-                key = parent[key]
-            path.append(list(key))  # Add start state
-            path.reverse()
-            
-            solution_depth = calculate_solution_depth(goal, parent)
+            moves = parent.moves_to(goal)
+            solution_depth = len(moves)
             
-            stats = {'cost': solution_depth, 'expanded': expanded, 'depth': max_depth, 'time': end_time - start_time}
+            stats = {'cost': solution_depth, 'expanded': expanded, 'depth': max_depth, 'time': elapsed}
             self.display_stats(stats)
-            self.animate_solution(path)
+            self.remember_solution(start, moves, stats)
+            self.animate_solution(start, moves)
             
             print("\n" + "="*50)
             print("DFS Algorithm Results")
             print("="*50)
-            print(f"Path to Goal: {len(path) - 1} moves")
+            print(f"Path to Goal: {len(moves)} moves")
             print(f"Cost of Path: {solution_depth}")
             print(f"Nodes Expanded: {expanded}")
             print(f"Max Search Depth: {max_depth}")
-            print(f"Running Time: {end_time - start_time:.4f} seconds")
+            print(f"Running Time: {elapsed:.4f} seconds")
             print("="*50 + "\n")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
-        finally:
-            self.run_btn.setEnabled(True)
 
 
 class IDFSTab(AlgorithmTab):
     def __init__(self):
         super().__init__("Iterative Deepening DFS", 'orange')
+        self.engine_combo = self.add_option_selector("🧭 ENGINE", ["Iterative Deepening DFS", "IDA* (Manhattan)",
+                                                                      "IDA* (Pattern DB)"])
+        self.workers_combo = self.add_option_selector("⚙️ WORKERS", list(WORKER_COUNTS))
     
     def check_solvable(self, state):
         return idfs_solvable(state)
     
+    @staticmethod
+    def run_idfs(start_state, progress, instrument=None):
+        """IDFS with its result shaped like IDA_Star's: (path, depth, expanded)"""
+        stats = {}
+        path, depth = IDFS(start_state, progress=progress, instrument=instrument, stats=stats)
+        return path, depth, stats['expanded']
+    
     def run_algorithm(self):
         start_state = self.puzzle_board.current_state.copy()
         
@@ -706,55 +930,87 @@ class IDFSTab(AlgorithmTab):
             QMessageBox.warning(self, "Unsolvable", "This puzzle is unsolvable!")
             return
         
+        pattern_database = PATTERN_DATABASES.get(len(start_state))
+        if self.engine_combo.currentIndex() == 2 and pattern_database is None:
+            QMessageBox.warning(self, "No Pattern Database", "There is no pattern database for this board size.")
+            return
+        
         # Store the initial state in input grid AND shared state
         self.input_grid.set_state(start_state)
         parent_window = self.window()
         if hasattr(parent_window, 'shared_state'):
             parent_window.shared_state = start_state
         
-        self.clear_output()
-        self.run_btn.setEnabled(False)
-        start_time = time.time()
+        if self.engine_combo.currentIndex() == 0:
+            cache_key = ("idfs", None)
+        elif self.engine_combo.currentIndex() == 1:
+            cache_key = ("idastar", heuristic_key(manhattan_distance))
+        else:
+            cache_key = ("idastar", heuristic_key(pattern_database))
+        if self.show_cached_solution(*cache_key, start_state):
+            return
+        
+        engine_name = self.engine_combo.currentText()
+        workers = WORKER_COUNTS[self.workers_combo.currentText()]
+        parallel_stats = {}
+        if workers > 1:
+            engine_name = f"{engine_name} ({workers} processes)"
+            if self.engine_combo.currentIndex() == 0:
+                job = lambda progress: Parallel_IDFS(start_state, workers, progress=progress, stats=parallel_stats)
+            else:
+                heuristic = manhattan_distance if self.engine_combo.currentIndex() == 1 else pattern_database
+                job = lambda progress: Parallel_IDA_Star(start_state, workers, heuristic, progress=progress,
+                                                         stats=parallel_stats)
+        elif self.engine_combo.currentIndex() == 0:
+            instrument = self.new_instrument()
+            job = lambda progress: self.run_idfs(start_state, progress, instrument)
+        elif self.engine_combo.currentIndex() == 1:
+            job = lambda progress: IDA_Star(start_state, progress=progress)
+        else:
+            job = lambda progress: IDA_Star(start_state, progress=progress, heuristic=pattern_database)
         
+        self.start_search(job, lambda result, elapsed: self.show_result(result, elapsed, engine_name,
+                                                                        parallel_stats))
+    
+    def show_result(self, result, elapsed, engine_name, parallel_stats=None):
         try:
-            import IDFS as idfs_module
-            result = idfs_module.IDFS(start_state)
-            end_time = time.time()
-            
             if result is None or result[0] is None:
                 QMessageBox.warning(self, "No Solution", "No solution found!")
-                self.run_btn.setEnabled(True)
                 return
             
-            # result is (path, depth)
-            path_tuples, solution_depth = result
-            path = [list(state) for state in path_tuples]
+            # result is (path, depth, expanded)
+            path_tuples, solution_depth, expanded = result
+            start = list(path_tuples[0])
+            moves = path_moves(path_tuples)
             
             stats = {
-                'cost': len(path) - 1, 
-                'expanded': idfs_module.total_expanded, 
+                'cost': len(moves), 
+                'expanded': expanded, 
                 'depth': solution_depth, 
-                'time': end_time - start_time
+                'time': elapsed
             }
+            if parallel_stats:
+                stats['utilization'] = parallel_stats['utilization']
             self.display_stats(stats)
-            self.animate_solution(path)
+            self.remember_solution(start, moves, stats)
+            self.animate_solution(start, moves)
             
             print("\n" + "="*50)
-            print("Iterative Deepening DFS Algorithm Results")
+            print(f"{engine_name} Algorithm Results")
             print("="*50)
-            print(f"Path to Goal: {len(path) - 1} moves")
-            print(f"Cost of Path: {len(path) - 1}")
-            print(f"Nodes Expanded: {idfs_module.total_expanded}")
+            print(f"Path to Goal: {len(moves)} moves ({moves})")
+            print(f"Cost of Path: {len(moves)}")
+            print(f"Nodes Expanded: {expanded}")
             print(f"Search Depth: {solution_depth}")
-            print(f"Running Time: {end_time - start_time:.4f} seconds")
+            if parallel_stats:
+                print(f"Subtrees: {parallel_stats['roots']}, Cores Busy: {parallel_stats['utilization']:.2f}")
+            print(f"Running Time: {elapsed:.4f} seconds")
             print("="*50 + "\n")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
             import traceback
             traceback.print_exc()
-        finally:
-            self.run_btn.setEnabled(True)
 
 
 class AStarTab(AlgorithmTab):
@@ -762,63 +1018,11 @@ class AStarTab(AlgorithmTab):
         super().__init__("A* Search", 'green')
         self.heuristic_combo = None
         self.add_heuristic_selector()
+        self.memory_combo = self.add_option_selector("🧠 MEMORY LIMIT", list(MEMORY_LIMITS))
     
     def add_heuristic_selector(self):
         """Add heuristic selection combo box"""
-        # Find the right panel layout
-        right_scroll = self.layout().itemAt(1).widget()
-        if isinstance(right_scroll, QScrollArea):
-            right_widget = right_scroll.widget()
-            right_layout = right_widget.layout()
-            
-            # Create heuristic frame
-            heuristic_frame = WoodenPanel()
-            h_layout = QVBoxLayout()
-            h_layout.setContentsMargins(12, 12, 12, 12)
-            
-            h_label = QLabel("🎯 HEURISTIC")
-            h_label.setFont(QFont("Arial Black", 10, QFont.Bold))
-            h_label.setStyleSheet("color: #FFD700;")
-            h_label.setAlignment(Qt.AlignCenter)
-            h_layout.addWidget(h_label)
-            
-            self.heuristic_combo = QComboBox()
-            self.heuristic_combo.addItems(["Manhattan", "Euclidean"])
-            self.heuristic_combo.setFont(QFont("Arial", 9, QFont.Bold))
-            self.heuristic_combo.setStyleSheet("""
-                QComboBox {
-                    background: #FFF8DC;
-                    border: 3px solid #8B6F47;
-                    border-radius: 8px;
-                    padding: 6px;
-                    color: #3E2723;
-                }
-                QComboBox:hover {
-                    border: 3px solid #D4AF37;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                }
-                QComboBox::down-arrow {
-                    image: none;
-                    border-left: 5px solid transparent;
-                    border-right: 5px solid transparent;
-                    border-top: 5px solid #8B6F47;
-                    margin-right: 6px;
-                }
-                QComboBox QAbstractItemView {
-                    background: #FFF8DC;
-                    border: 3px solid #8B6F47;
-                    selection-background-color: #D4AF37;
-                    selection-color: #3E2723;
-                }
-            """)
-            h_layout.addWidget(self.heuristic_combo)
-            
-            heuristic_frame.setLayout(h_layout)
-            
-            # Insert after input frame (position 1)
-            right_layout.insertWidget(1, heuristic_frame)
+        self.heuristic_combo = self.add_option_selector("🎯 HEURISTIC", list(HEURISTICS))
     
     def check_solvable(self, state):
         return astar_solvable(state)
@@ -830,8 +1034,11 @@ class AStarTab(AlgorithmTab):
             QMessageBox.warning(self, "Unsolvable", "This puzzle is unsolvable!")
             return
         
-        heuristic = manhattan_distance if self.heuristic_combo.currentIndex() == 0 else euclidean_distance
-        heuristic_name = "Manhattan" if self.heuristic_combo.currentIndex() == 0 else "Euclidean"
+        heuristic_name = self.heuristic_combo.currentText()
+        heuristic = HEURISTICS[heuristic_name]
+        if not heuristic_fits(heuristic, start_state):
+            QMessageBox.warning(self, "Wrong Board Size", f"{heuristic_name} was built for another board size.")
+            return
         
         # Store the initial state in input grid AND shared state
         self.input_grid.set_state(start_state)
@@ -839,40 +1046,101 @@ class AStarTab(AlgorithmTab):
         if hasattr(parent_window, 'shared_state'):
             parent_window.shared_state = start_state
         
-        self.clear_output()
-        self.run_btn.setEnabled(False)
-        start_time = time.time()
+        max_nodes = MEMORY_LIMITS[self.memory_combo.currentText()]
+        algorithm = "astar" if max_nodes is None else "smastar"
+        if self.show_cached_solution(algorithm, heuristic_key(heuristic), start_state):
+            return
         
+        if max_nodes is None:
+            instrument = self.new_instrument()
+            job = lambda progress: A_Star(start_state, heuristic, progress=progress, instrument=instrument)
+        else:
+            job = lambda progress: SMA_Star(start_state, heuristic, progress=progress, max_nodes=max_nodes)
+        self.start_search(job, lambda result, elapsed: self.show_result(result, elapsed, heuristic_name,
+                                                                        start_state))
+    
+    def show_result(self, result, elapsed, heuristic_name, start):
         try:
-            parent, expanded, cost, depth = A_Star(start_state, heuristic)
-            end_time = time.time()
+            if result is None:
+                QMessageBox.warning(self, "No Solution", "No solution fits in the memory limit!")
+                return
             
-            goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-            path = []
-            current = goal
-            while current is not None:
-                path.append(current)
-                current = parent[tuple(current)]
-            path.reverse()
+            # SMA* adds (peak nodes, regenerations) to A*'s (parent, expanded, cost, depth)
+            parent, expanded, cost, depth = result[:4]
             
-            stats = {'cost': cost, 'expanded': expanded, 'depth': depth, 'time': end_time - start_time}
+            moves = parent.moves_to(goal_state(*dimensions(start)))
+            
+            stats = {'cost': cost, 'expanded': expanded, 'depth': depth, 'time': elapsed}
+            if len(result) == 6:
+                stats['peak'], stats['regenerated'] = result[4:]
             self.display_stats(stats)
-            self.animate_solution(path)
+            self.remember_solution(start, moves, stats)
+            self.animate_solution(start, moves)
             
             print("\n" + "="*50)
             print(f"A* Algorithm Results ({heuristic_name} Heuristic)")
             print("="*50)
-            print(f"Path to Goal: {len(path) - 1} moves")
+            print(f"Path to Goal: {len(moves)} moves ({moves})")
             print(f"Cost of Path: {cost}")
             print(f"Nodes Expanded: {expanded}")
             print(f"Search Depth: {depth}")
-            print(f"Running Time: {end_time - start_time:.4f} seconds")
+            if 'peak' in stats:
+                print(f"Peak Nodes: {stats['peak']}, Regenerations: {stats['regenerated']}")
+            print(f"Running Time: {elapsed:.4f} seconds")
+            print("="*50 + "\n")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error: {str(e)}")
+
+
+class DatabaseTab(AlgorithmTab):
+    def __init__(self):
+        super().__init__("State Database Lookup", 'pink')
+    
+    def check_solvable(self, state):
+        return bfs_solvable(state)
+    
+    def run_algorithm(self):
+        start_state = self.puzzle_board.current_state.copy()
+        
+        if len(start_state) != state_database.SIZE:
+            QMessageBox.warning(self, "Wrong Board Size", "The state database only covers the 3x3 board.")
+            return
+        
+        if not self.check_solvable(start_state):
+            QMessageBox.warning(self, "Unsolvable", "This puzzle is unsolvable!")
+            return
+        
+        # Store the initial state in input grid AND shared state
+        self.input_grid.set_state(start_state)
+        parent_window = self.window()
+        if hasattr(parent_window, 'shared_state'):
+            parent_window.shared_state = start_state
+        
+        # The table is built on first use (a few seconds) and memory-mapped after that
+        self.start_search(lambda progress: state_database.Lookup(start_state, state_database.load_database()),
+                          self.show_result)
+    
+    def show_result(self, result, elapsed):
+        try:
+            path, expanded, cost, depth = result
+            moves = path_moves(path)
+            
+            stats = {'cost': cost, 'expanded': expanded, 'depth': depth, 'time': elapsed}
+            self.display_stats(stats)
+            self.animate_solution(path[0], moves)
+            
+            print("\n" + "="*50)
+            print("State Database Lookup Results")
+            print("="*50)
+            print(f"Path to Goal: {len(moves)} moves ({moves})")
+            print(f"Cost of Path: {cost}")
+            print(f"Table Probes: {expanded}")
+            print(f"Running Time: {elapsed:.6f} seconds")
             print("="*50 + "\n")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
-        finally:
-            self.run_btn.setEnabled(True)
 
 
 class MainWindow(QMainWindow):
@@ -881,6 +1149,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.shared_state = [0, 1, 2, 3, 4, 5, 6, 7, 8]  # Shared state across all tabs
+        self.solution_cache = SolutionCache(path=SOLUTION_CACHE_PATH)  # Shared by all tabs, kept across runs
         self.init_ui()
     
     def init_ui(self):
@@ -948,14 +1217,30 @@ class MainWindow(QMainWindow):
         header_layout = QVBoxLayout()
         header_layout.setContentsMargins(20, 15, 20, 15)
         
-        title = QLabel("🎮 8-PUZZLE GAME SOLVER")
-        title.setFont(QFont("Arial Black", 24, QFont.Bold))
-        title.setStyleSheet("""
+        self.title = QLabel("🎮 8-PUZZLE GAME SOLVER")
+        self.title.setFont(QFont("Arial Black", 24, QFont.Bold))
+        self.title.setStyleSheet("""
             color: #FFD700; 
             text-shadow: 4px 4px 8px rgba(0,0,0,0.8);
         """)
-        title.setAlignment(Qt.AlignCenter)
-        header_layout.addWidget(title)
+        self.title.setAlignment(Qt.AlignCenter)
+        header_layout.addWidget(self.title)
+        
+        # Board size selector
+        self.size_combo = QComboBox()
+        self.size_combo.addItems(list(BOARD_SIZES))
+        self.size_combo.setFont(QFont("Arial", 10, QFont.Bold))
+        self.size_combo.setStyleSheet("""
+            QComboBox {
+                background: #FFF8DC;
+                border: 3px solid #8B6F47;
+                border-radius: 8px;
+                padding: 4px 10px;
+                color: #3E2723;
+            }
+        """)
+        self.size_combo.currentTextChanged.connect(self.change_board_size)
+        header_layout.addWidget(self.size_combo, alignment=Qt.AlignCenter)
         
         # Subtitle REMOVED - no longer displayed
         
@@ -970,6 +1255,7 @@ class MainWindow(QMainWindow):
         self.dfs_tab = DFSTab()
         self.idfs_tab = IDFSTab()
         self.astar_tab = AStarTab()
+        self.database_tab = DatabaseTab()
         
         # Connect tab change signal to sync states
         self.tabs.currentChanged.connect(self.sync_tab_states)
@@ -978,9 +1264,10 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.dfs_tab, "🟣 DFS")
         self.tabs.addTab(self.idfs_tab, "🟠 IDFS")
         self.tabs.addTab(self.astar_tab, "🟢 A*")
+        self.tabs.addTab(self.database_tab, "🌸 DATABASE")
         
         # Initialize all tabs with shared state
-        for tab in [self.bfs_tab, self.dfs_tab, self.idfs_tab, self.astar_tab]:
+        for tab in self.all_tabs():
             tab.input_grid.set_state(self.shared_state)
             tab.puzzle_board.set_state(self.shared_state)
         
@@ -990,6 +1277,27 @@ class MainWindow(QMainWindow):
         
         central_widget.setLayout(layout)
     
+    def all_tabs(self):
+        return [self.bfs_tab, self.dfs_tab, self.idfs_tab, self.astar_tab, self.database_tab]
+    
+    def change_board_size(self, size_name):
+        """Switch every tab to the solved board of the chosen size"""
+        cols = BOARD_SIZES[size_name]
+        self.shared_state = goal_state(cols)
+        self.title.setText(f"🎮 {cols * cols - 1}-PUZZLE GAME SOLVER")
+        for tab in self.all_tabs():
+            tab.input_grid.set_state(self.shared_state)
+            tab.reset_board()
+    
+    def closeEvent(self, event):
+        """Stop running searches before the window goes away"""
+        for tab in self.all_tabs():
+            if tab.worker is not None:
+                tab.worker.cancel()
+                tab.worker.wait()
+        self.solution_cache.close()
+        super().closeEvent(event)
+    
     def sync_tab_states(self, index):
         """Sync the input state across all tabs when switching"""
         # Get the tab we're switching TO
@@ -0,0 +1,169 @@
+"""
+IDA* for the 8-puzzle and larger sliding puzzles (board size taken from start).
+
+Iterative deepening on f = g + h instead of on depth: each iteration is a
+depth-first search that cuts off any node whose f exceeds the threshold,
+and the next threshold is the smallest f that was cut off. The search
+works on a single board buffer, applying a move before recursing and
+undoing it afterwards and never undoes the previous move. Heuristics with
+a tile_table (Manhattan by default) are kept up to date from the one tile
+that moved; others, such as the pattern databases, are evaluated on the
+buffer after each move.
+"""
+
+from A_star import manhattan_distance, tile_table
+from board import dimensions, goal_state
+
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+FOUND = -1
+# Slack when comparing f with the threshold: a real-valued h (Euclidean)
+# updated incrementally drifts by rounding, while moves only cost whole units
+EPSILON = 1e-9
+
+UP, DOWN, LEFT, RIGHT, NONE = 0, 1, 2, 3, 4
+INVERSE = (DOWN, UP, RIGHT, LEFT, None)
+
+
+def _build_moves(cols, rows, table):
+    # moves[blank] = ((target, direction, delta), ...) where delta[tile] is the
+    # change in h when tile slides from target into blank (None without a table).
+    moves = []
+    for blank in range(cols * rows):
+        i, j = divmod(blank, cols)
+        entries = []
+        for direction, (di, dj) in enumerate(((-1, 0), (1, 0), (0, -1), (0, 1))):
+            ni, nj = i + di, j + dj
+            if 0 <= ni < rows and 0 <= nj < cols:
+                target = ni * cols + nj
+                delta = None
+                if table is not None:
+                    delta = tuple(table[tile][blank] - table[tile][target] for tile in range(cols * rows))
+                entries.append((target, direction, delta))
+        moves.append(tuple(entries))
+    return tuple(moves)
+
+
+_moves_cache = {}
+
+
+def _moves_for(cols, rows, table):
+    key = (cols, rows, id(table))
+    if key not in _moves_cache:
+        _moves_cache[key] = _build_moves(cols, rows, table)
+    return _moves_cache[key]
+
+
+def IDA_Star(start, progress=None, max_depth=None, heuristic=manhattan_distance):
+    """Solve start with IDA* and an admissible heuristic(current, goal).
+
+    The board size comes from start. max_depth defaults to 8 moves per cell,
+    above the optimal solution length of any 3x3, 4x4 or 5x5 board.
+
+    Returns (path, depth, expanded): path is the list of state tuples from
+    start to goal (None if no solution within max_depth), depth the final
+    f-threshold and expanded the number of nodes expanded over all
+    iterations.
+    """
+    cols, rows = dimensions(start)
+    goal = goal_state(cols, rows)
+    if max_depth is None:
+        max_depth = 8 * cols * rows
+    state = list(start)
+    moves = []  # blank positions after each move, replayed to build the path
+    threshold = heuristic(state, goal)
+    table = tile_table(heuristic, goal)
+    all_moves = _moves_for(cols, rows, table)
+
+    def tick(expanded):
+        progress(expanded, len(moves), threshold)
+
+    search, expanded = bounded_search(state, goal, heuristic, all_moves, moves,
+                                      tick if progress is not None else None)
+    blank = state.index(0)
+    h = threshold
+    while threshold <= max_depth:
+        t = search(0, h, blank, NONE, threshold)
+        if t == FOUND:
+            return _replay(start, moves), threshold, expanded()
+        if t == float("inf"):
+            break
+        threshold = t
+    return None, threshold, expanded()
+
+
+def bounded_search(state, goal, heuristic, all_moves, moves, tick=None):
+    """The depth-first search of one IDA* iteration, on the board buffer state.
+
+    Returns (search, expanded). search(g, h, blank, prev, threshold) returns
+    FOUND, with the blank positions of the moves from the root appended to
+    moves, or the smallest f above threshold that was cut off. expanded()
+    counts the expansions of every call so far; tick(expanded) is called
+    every PROGRESS_INTERVAL of them and may raise to abandon the search.
+    """
+    expanded = 0
+    incremental = all_moves[0][0][2] is not None
+    # An integer h is exact, so h == 0 is a cheap pre-test for the goal
+    exact = isinstance(heuristic(state, goal), int)
+
+    def search(g, h, blank, prev, threshold):
+        nonlocal expanded
+        f = g + h
+        if f > threshold + EPSILON:
+            return f
+        if (h == 0 or not exact) and state == goal:
+            return FOUND
+
+        expanded += 1
+        if tick is not None and expanded % PROGRESS_INTERVAL == 0:
+            tick(expanded)
+
+        minimum = float("inf")
+        skip = INVERSE[prev]
+        for target, direction, delta in all_moves[blank]:
+            if direction == skip:
+                continue
+            tile = state[target]
+            state[blank] = tile
+            state[target] = 0
+            moves.append(target)
+            if incremental:
+                t = search(g + 1, h + delta[tile], target, direction, threshold)
+            else:
+                t = search(g + 1, heuristic(state, goal), target, direction, threshold)
+            if t == FOUND:
+                return FOUND
+            moves.pop()
+            state[target] = tile
+            state[blank] = 0
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    return search, lambda: expanded
+
+
+def _replay(start, moves):
+    state = list(start)
+    blank = state.index(0)
+    path = [tuple(state)]
+    for target in moves:
+        state[blank], state[target] = state[target], 0
+        blank = target
+        path.append(tuple(state))
+    return path
+
+
+if __name__ == "__main__":
+    import time
+    from IDFS import checkinstances, print_path
+
+    start = [1, 0, 2, 7, 5, 4, 8, 6, 3]
+
+    if checkinstances(start):
+        start_time = time.time()
+        path, depth, expanded = IDA_Star(start)
+        print_path(path)
+        print(f"Nodes expanded: {expanded}, Search depth: {depth}")
+        print(f"Execution time: {time.time() - start_time:.4f} seconds")
+    else:
+        print("This puzzle is unsolvable!")
@@ -1,67 +1,97 @@
-def IDFS(arr):
+import board
+from board import format_board, goal_state
+from packed_state import board_for, neighbours, pack
+
+GOAL = pack([0, 1, 2, 3, 4, 5, 6, 7, 8])
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+MAX_DEPTH = 50
+
+
+def IDFS(arr, progress=None, instrument=None, stats=None):
+    """Iterative deepening DFS; returns (path of state tuples or None, depth).
+
+    If stats is a dict, 'expanded' (the total) and 'iterations' (states
+    expanded under each depth limit, from 0 up) are stored in it.
+    """
+    if stats is None:
+        stats = {}
+    stats['expanded'] = 0
+    stats['iterations'] = iterations = []
     depth = 0
-    global total_expanded
-    total_expanded = 0
-    while depth < 50:  # Add max depth limit
-        result = DFS(arr, depth, [tuple(arr)])
+    # Board size comes from the start state (3x3, 4x4, ...)
+    packed = board_for(arr)
+    target = packed.pack(goal_state(packed.cols, packed.rows))
+    start = packed.pack(arr)
+    while depth < MAX_DEPTH:
+        result, expanded = DLS(start, depth, target, packed.neighbours, progress, instrument,
+                               stats['expanded'])
+        iterations.append(expanded)
+        stats['expanded'] += expanded
         if result:
-            return result, depth
+            return [tuple(packed.unpack(state)) for state in result], depth
         depth += 1
     return None, depth
 
 
-def DFS(node, depth, path):
-    global total_expanded
-    if Isgoal(node):
-        return path
-    
-    if depth == 0:
-        return None
-    
-    total_expanded += 1  
-    for neighbour in getneighbours(node):
-        neighbour_key = tuple(neighbour)
-        if neighbour_key not in path:
-            result = DFS(neighbour, depth - 1, path + [neighbour_key])
-            if result:
-                return result
-    
-    return None
+def DLS(start, limit, goal=GOAL, neighbours=neighbours, progress=None, instrument=None, done=0):
+    """Depth-limited search on packed states without recursion.
+
+    Returns (path of packed states or None, states expanded). The current
+    branch is kept in a list of limit + 1 slots and mirrored in a set, so
+    a child is checked against the branch in O(1); each level keeps an
+    iterator over the children it has yet to try. done is only added to
+    the counts given to progress (expansions in earlier iterations).
+    """
+    if start == goal:
+        return [start], 0
+    if limit == 0:
+        return None, 0
+    path = [start] + [0] * limit
+    on_path = {start}
+    pending = [None] * limit  # pending[d]: children of path[d] not tried yet
+    expanded = 0
+    depth = 0
+    node = start
+    while True:
+        # Expand node, which sits at path[depth] with depth < limit
+        expanded += 1
+        if progress is not None and (done + expanded) % PROGRESS_INTERVAL == 0:
+            progress(done + expanded, depth + 1, depth)
+        children = neighbours(node)
+        if instrument is not None:
+            instrument.expand(depth, depth + 1)
+            instrument.generate(len(children), sum(child in on_path for child in children))
+        pending[depth] = iter(children)
+        # Take the next child off the path, backing up past exhausted levels
+        while True:
+            for node in pending[depth]:
+                if node not in on_path:
+                    break
+            else:
+                on_path.discard(path[depth])
+                if depth == 0:
+                    return None, expanded
+                depth -= 1
+                continue
+            if node == goal:
+                path[depth + 1] = node
+                return path[:depth + 2], expanded
+            if depth + 1 < limit:
+                break
+            # node is at the depth limit: checked, not expanded
+        depth += 1
+        path[depth] = node
+        on_path.add(node)
 
 
 def getneighbours(arr):
-    neighbours = []
-    arr_list = list(arr) if isinstance(arr, tuple) else arr
-    index = arr_list.index(0)
-    i, j = divmod(index, 3)
-
-    if i - 1 >= 0:  # up
-        a = arr_list.copy()
-        ni = (i - 1) * 3 + j
-        a[index], a[ni] = a[ni], a[index]
-        neighbours.append(a)
-    if i + 1 <= 2:  # down
-        a = arr_list.copy()
-        ni = (i + 1) * 3 + j
-        a[index], a[ni] = a[ni], a[index]
-        neighbours.append(a)
-    if j - 1 >= 0:  # left
-        a = arr_list.copy()
-        nj = i * 3 + (j - 1)
-        a[index], a[nj] = a[nj], a[index]
-        neighbours.append(a)
-    if j + 1 <= 2:  # right
-        a = arr_list.copy()
-        nj = i * 3 + (j + 1)
-        a[index], a[nj] = a[nj], a[index]
-        neighbours.append(a)
-    return neighbours
+    packed = board_for(arr)
+    return [packed.unpack(neighbour) for neighbour in packed.neighbours(packed.pack(arr))]
 
 
 def Isgoal(arr):
-    goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
     arr_list = list(arr) if isinstance(arr, tuple) else arr
-    return arr_list == goal
+    return arr_list == goal_state(*board.dimensions(arr_list))
 
 
 def print_path(path):
@@ -69,17 +99,22 @@ def print_path(path):
     print("\nPath from start to goal:")
     for step, state in enumerate(path):
         print(f"\nStep {step}:")
-        state_list = list(state)
-        for i in range(0, 9, 3):
-            print(state_list[i:i+3])
+        for row in format_board(list(state)):
+            print(row)
 
 
 def checkinstances(arr):
-    # Exclude 0 from inversion count
-    filtered = [x for x in arr if x != 0]
-    num = 0
-    for i in range(len(filtered)):
-        for j in range(i+1, len(filtered)):
-            if filtered[i] > filtered[j]:
-                num += 1
-    return num % 2 == 0
+    # Inversion parity, plus the blank's row on even widths
+    return board.is_solvable(arr)
+
+
+if __name__ == "__main__":
+    start = [1, 0, 2, 7, 5, 4, 8, 6, 3]
+
+    if checkinstances(start):
+        stats = {}
+        path, depth = IDFS(start, stats=stats)
+        print_path(path)
+        print(f"Nodes expanded: {stats['expanded']}, Search depth: {depth}")
+    else:
+        print("This puzzle is unsolvable!")
@@ -0,0 +1,222 @@
+"""
+SMA* (simplified memory-bounded A*) for sliding puzzles.
+
+A* keeps every state it generates. SMA* keeps at most max_nodes search-tree
+nodes: when memory is full it forgets the worst leaf (highest f, shallowest
+first) and backs its f-value up into the parent, which remembers the lowest
+f among its forgotten children. Once that value is the best on offer the
+parent is put back on the open list and the forgotten children are
+regenerated. The path found is optimal whenever it fits in memory (its
+length is below max_nodes); if it does not, no path is returned.
+
+Nodes are kept in a tree without duplicate detection, as in IDA*, and a
+move straight back to the parent's state is never generated.
+"""
+
+import heapq
+
+from A_star import manhattan_distance, tile_table
+from board import dimensions, goal_state
+from packed_state import PackedMap, board_for
+
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+DEFAULT_MAX_NODES = 100000
+# Memory per kept node (node object, children dict, heap entries) used to turn
+# max_bytes into a node budget; tracemalloc shows about 520 bytes on 3x3 boards
+NODE_BYTES = 600
+INF = float("inf")
+
+
+class _Node:
+    __slots__ = ("state", "parent", "g", "h", "f", "depth", "children", "forgotten_f",
+                 "expanded", "open_stamp", "leaf_stamp")
+
+    def __init__(self, state, parent, g, h, f):
+        self.state = state
+        self.parent = parent
+        self.g = g
+        self.h = h
+        self.f = f
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.children = {}      # state -> _Node, for the children kept in memory
+        self.forgotten_f = INF  # lowest f among forgotten children
+        self.expanded = False
+        self.open_stamp = None
+        self.leaf_stamp = None
+
+
+def SMA_Star(start, heuristic=manhattan_distance, progress=None, max_nodes=None, max_bytes=None):
+    """Solve start with SMA*, keeping at most max_nodes nodes in memory.
+
+    The budget can also be given as max_bytes, which is converted at
+    NODE_BYTES per node; with neither, DEFAULT_MAX_NODES is used.
+
+    Returns (Parent, expanded, cost, depth, peak_nodes, regenerated) like
+    A_Star plus the largest number of nodes held at once and the number of
+    nodes generated again after being forgotten. Parent only holds the
+    states on the solution path. Returns None if no solution fits.
+    """
+    if max_nodes is None:
+        max_nodes = max_bytes // NODE_BYTES if max_bytes is not None else DEFAULT_MAX_NODES
+    if max_nodes < 2:
+        raise ValueError("SMA* needs room for at least two nodes")
+
+    cols, rows = dimensions(start)
+    goal = goal_state(cols, rows)
+    packed = board_for(start)
+    target = packed.pack(goal)
+    table = tile_table(heuristic, goal)
+
+    open_heap = []  # (key, -depth, stamp, node): lowest f first, deepest on ties
+    leaf_heap = []  # (-f, depth, stamp, node): highest f first, shallowest on ties
+    counter = 0
+    count = peak = 1
+    expanded = regenerated = search_depth = 0
+
+    def push_open(node, key):
+        nonlocal counter
+        counter += 1
+        node.open_stamp = counter
+        heapq.heappush(open_heap, (key, -node.depth, counter, node))
+
+    def push_leaf(node):
+        nonlocal counter
+        counter += 1
+        node.leaf_stamp = counter
+        heapq.heappush(leaf_heap, (-node.f, node.depth, counter, node))
+
+    def worst_leaf(pinned):
+        # Top of leaf_heap after dropping stale entries; pinned (being expanded) is kept
+        held = []
+        worst = None
+        while leaf_heap:
+            entry = leaf_heap[0]
+            node = entry[3]
+            if node.leaf_stamp != entry[2] or node.children or node.parent is None:
+                heapq.heappop(leaf_heap)
+            elif node is pinned:
+                held.append(heapq.heappop(leaf_heap))
+            else:
+                worst = node
+                break
+        for entry in held:
+            heapq.heappush(leaf_heap, entry)
+        return worst
+
+    def backup(node):
+        # Recompute f from the children and forgotten children, up the tree while it changes
+        while node is not None and node.expanded:
+            f = node.forgotten_f
+            for child in node.children.values():
+                if child.f < f:
+                    f = child.f
+            if f == node.f:
+                break
+            node.f = f
+            if not node.children:
+                push_leaf(node)
+            node = node.parent
+
+    def forget(leaf):
+        nonlocal count
+        leaf.open_stamp = leaf.leaf_stamp = None
+        count -= 1
+        parent = leaf.parent
+        del parent.children[leaf.state]
+        if leaf.f < parent.forgotten_f:
+            parent.forgotten_f = leaf.f
+        push_open(parent, parent.forgotten_f)
+        if not parent.children:
+            push_leaf(parent)
+        backup(parent)
+
+    s = packed.pack(start)
+    h = heuristic(start, goal)
+    if h >= max_nodes - 1 and s != target:
+        # Every solution has at least h moves, so none can be held in memory
+        print("No Solution Found within the memory limit")
+        return None
+    root = _Node(s, None, 0, h, h)
+    push_open(root, h)
+    push_leaf(root)
+
+    while open_heap:
+        key, _, stamp, node = heapq.heappop(open_heap)
+        if node.open_stamp != stamp:
+            continue
+        node.open_stamp = None
+        if key == INF:
+            break
+        if node.state == target and not node.expanded:
+            return _result(packed, node), expanded, node.g, search_depth, peak, regenerated
+
+        expanded += 1
+        if progress is not None and expanded % PROGRESS_INTERVAL == 0:
+            progress(expanded, count, search_depth)
+
+        # First expansion: every successor; later ones: only the forgotten ones,
+        # which are all known to have f >= key
+        regenerating = node.expanded
+        node.expanded = True
+        node.forgotten_f = INF
+        skip = node.parent.state if node.parent is not None else None
+        depth = node.depth + 1
+        for child_state, tile, source, dest in packed.moves(node.state):
+            if child_state == skip or child_state in node.children:
+                continue
+            g = node.g + 1
+            if table is not None:
+                h = node.h + table[tile][dest] - table[tile][source]
+            else:
+                h = heuristic(packed.unpack(child_state), goal)
+            f = max(g + h, key)
+            if depth >= max_nodes - 1 and child_state != target:
+                f = INF  # the path to any goal below here cannot fit in memory
+            if count >= max_nodes:
+                worst = worst_leaf(node)
+                if worst is None or (f, -depth) >= (worst.f, -worst.depth):
+                    if f < node.forgotten_f:
+                        node.forgotten_f = f
+                    continue
+                forget(worst)
+            child = _Node(child_state, node, g, h, f)
+            node.children[child_state] = child
+            count += 1
+            if regenerating:
+                regenerated += 1
+            push_open(child, f)
+            push_leaf(child)
+        if count > peak:
+            peak = count
+        if depth > search_depth:
+            search_depth = depth
+
+        if node.forgotten_f < INF:
+            push_open(node, node.forgotten_f)
+        backup(node)
+        if not node.children:
+            push_leaf(node)
+
+    print("No Solution Found within the memory limit")
+    return None
+
+
+def _result(packed, node):
+    parents = {}
+    while node is not None:
+        parents[node.state] = node.parent.state if node.parent is not None else None
+        node = node.parent
+    return PackedMap(parents, board=packed)
+
+
+if __name__ == "__main__":
+    import time
+    from A_star import printPath
+
+    start = [8, 7, 6, 0, 4, 1, 2, 5, 3]
+    for max_nodes in (100000, 2000, 500):
+        start_time = time.time()
+        Parent, expanded, cost, depth, peak, regenerated = SMA_Star(start, max_nodes=max_nodes)
+        print(f"max_nodes={max_nodes}: cost of path: {cost}, Nodes expanded: {expanded}, "
+              f"Search depth: {depth}, Peak nodes: {peak}, Regenerated: {regenerated}, "
+              f"Execution time: {time.time() - start_time:.4f} seconds")
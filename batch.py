@@ -0,0 +1,168 @@
+"""
+Solve many boards at once on a process pool and stream the results as
+JSON Lines.
+
+Input has one board per line, either as numbers ("1 0 2 7 5 4 8 6 3" or
+"1,0,2,...") or as JSON: a list, or an object with a "state" list and an
+optional "id" that is copied to the result. Blank lines and lines starting
+with # are skipped. Each output line describes one board:
+
+    {"index": 0, "state": [...], "algorithm": "astar", "length": 23,
+     "moves": "RDLDRUULDDLURULDRRDLLUU", "expanded": 1510, "depth": 23,
+     "time": 0.0091}
+
+"moves" names the direction the blank goes at each step (board.MOVE_LETTERS);
+--path adds the full list of states as well.
+
+Results are written as soon as a worker finishes them; --ordered writes
+them in input order instead. Boards that cannot be parsed or solved get an
+"error" field instead of the statistics.
+
+    python batch.py puzzles.txt -a astar --heuristic manhattan
+    python batch.py - -a idastar --ordered < puzzles.txt > results.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+
+import BFS
+from board import path_moves
+from instrumentation import Instrument
+from solve import ALGORITHMS, HEURISTICS, parse_state, solve
+
+
+def read_puzzles(lines):
+    """Yield (id, state, error) for each board in lines."""
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        puzzle_id = None
+        try:
+            if line[0] in "[{":
+                value = json.loads(line)
+                if isinstance(value, dict):
+                    puzzle_id = value.get("id")
+                    value = value["state"]
+                state = parse_state([" ".join(map(str, value))])
+            else:
+                state = parse_state([line])
+        except (ValueError, KeyError, TypeError) as e:
+            yield puzzle_id, None, f"line {number}: {e}"
+            continue
+        yield puzzle_id, state, None
+
+
+def _silence_worker():
+    # Some solvers print while they search; keep that out of the JSON stream.
+    sys.stdout = open(os.devnull, "w")
+
+
+def _solve_one(job):
+    index, puzzle_id, state, algorithm, heuristic, include_path, instrument = job
+    record = {"index": index}
+    if puzzle_id is not None:
+        record["id"] = puzzle_id
+    record["state"] = state
+    record["algorithm"] = algorithm
+    if not BFS.is_solvable(state):
+        record["error"] = "unsolvable"
+        return record
+    try:
+        path, stats = solve(state, algorithm, heuristic, instrument=Instrument() if instrument else None)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    if path is None:
+        record["error"] = "no solution found"
+        return record
+    record["length"] = len(path) - 1
+    record["moves"] = path_moves(path)
+    record["expanded"] = stats["expanded"]
+    record["depth"] = stats["depth"]
+    record["time"] = round(stats["time"], 6)
+    if include_path:
+        record["path"] = [list(s) for s in path]
+    if instrument:
+        record["instrumentation"] = stats["instrumentation"]
+    return record
+
+
+def solve_batch(puzzles, algorithm="astar", heuristic="manhattan", processes=None,
+                chunksize=None, ordered=False, include_path=False, instrument=False):
+    """Solve (id, state, error) puzzles on a process pool, yielding one result dict each.
+
+    Results come in completion order unless ordered is true. chunksize
+    defaults to about four chunks per worker, which keeps the workers busy
+    without sending every board through the pipe on its own. instrument adds
+    each search's Instrument record (without memory tracking) to its result.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    processes = processes or os.cpu_count() or 1
+    jobs = []
+    errors = []  # records for boards that could not be parsed, in input order
+    for index, (puzzle_id, state, error) in enumerate(puzzles):
+        if error is not None:
+            record = {"index": index, "error": error}
+            if puzzle_id is not None:
+                record["id"] = puzzle_id
+            errors.append(record)
+        else:
+            jobs.append((index, puzzle_id, state, algorithm, heuristic, include_path, instrument))
+    if not ordered or not jobs:
+        yield from errors
+        errors = []
+    if not jobs:
+        return
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (processes * 4))
+
+    with multiprocessing.Pool(processes, initializer=_silence_worker) as pool:
+        run = pool.imap if ordered else pool.imap_unordered
+        pending = iter(errors)
+        error = next(pending, None)
+        for record in run(_solve_one, jobs, chunksize):
+            while error is not None and error["index"] < record["index"]:
+                yield error
+                error = next(pending, None)
+            yield record
+        if error is not None:
+            yield error
+            yield from pending
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of boards on a process pool (JSON Lines output).")
+    parser.add_argument("input", help="file with one board per line, or - for stdin")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="astar")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS), default="manhattan",
+                        help="heuristic used by astar, idastar and smastar")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="boards handed to a worker at a time")
+    parser.add_argument("--ordered", action="store_true", help="write results in input order")
+    parser.add_argument("--path", action="store_true", help="include the solution path as a list of states")
+    parser.add_argument("--instrument", action="store_true",
+                        help="include search counters (generated, duplicates, per-depth expansions, ...)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin if args.input == "-" else stack.enter_context(open(args.input))
+        out = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w"))
+        puzzles = list(read_puzzles(source))
+        for record in solve_batch(puzzles, args.algorithm, args.heuristic, args.processes,
+                                  args.chunksize, args.ordered, args.path, args.instrument):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
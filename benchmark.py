@@ -0,0 +1,703 @@
+"""
+Benchmarks for the 8-puzzle solvers.
+
+Each benchmark runs in its own fresh interpreter where that matters (import
+cost, peak memory), so results are not skewed by what an earlier run left
+behind.
+
+    python benchmark.py startup
+    python benchmark.py encoding
+    python benchmark.py idastar
+    python benchmark.py heuristic
+    python benchmark.py pdb
+    python benchmark.py batch
+    python benchmark.py bfs
+    python benchmark.py bibfs
+    python benchmark.py symmetry
+    python benchmark.py smastar
+    python benchmark.py openlist
+    python benchmark.py buckets
+    python benchmark.py vectorized
+    python benchmark.py hda
+    python benchmark.py suite
+    python benchmark.py idfs
+
+The suite benchmark is benchmark_suite.py with its defaults; run that
+module directly for JSON output, solver selection and comparisons.
+"""
+
+import argparse
+import contextlib
+import heapq
+import io
+import json
+import resource
+import subprocess
+import sys
+import time
+from queue import Queue
+
+
+SOLVER_MODULES = ["BFS", "DFS", "IDFS", "A_star"]
+SEARCH_FUNCTIONS = {"BFS", "DfS", "IDFS", "DFS", "A_Star", "getNeighbours", "getneighbours"}
+
+
+# Imports one solver module with a profile hook installed and reports every
+# search function that was entered while the module body was executing.
+_IMPORT_PROBE = r"""
+import io, json, sys, time
+names = set(sys.argv[2].split(","))
+called = set()
+def hook(frame, event, arg):
+    if event == "call" and frame.f_code.co_name in names:
+        called.add(frame.f_code.co_name)
+out = io.StringIO()
+real_stdout, sys.stdout = sys.stdout, out
+sys.setprofile(hook)
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+sys.setprofile(None)
+sys.stdout = real_stdout
+print(json.dumps({"time": elapsed, "called": sorted(called), "stdout": out.getvalue()}))
+"""
+
+
+def bench_startup(repeat=5):
+    """Time importing each solver module and assert that no search runs."""
+    print(f"{'module':<10} {'best import':>12}")
+    for module in SOLVER_MODULES:
+        best = float("inf")
+        for _ in range(repeat):
+            result = subprocess.run(
+                [sys.executable, "-c", _IMPORT_PROBE, module, ",".join(sorted(SEARCH_FUNCTIONS))],
+                capture_output=True, text=True, check=True,
+            )
+            report = json.loads(result.stdout)
+            assert not report["called"], f"importing {module} ran {report['called']}"
+            assert not report["stdout"], f"importing {module} printed output:\n{report['stdout']}"
+            best = min(best, report["time"])
+        print(f"{module:<10} {best * 1000:>10.2f}ms")
+    print("OK: importing the solvers does no search work")
+
+
+# The two hardest 8-puzzle instances: 31 moves from the goal.
+HARDEST = [
+    [8, 7, 6, 0, 4, 1, 2, 5, 3],
+    [8, 0, 6, 5, 4, 7, 2, 3, 1],
+]
+
+
+def _legacy_neighbours(v):
+    # List-based neighbour generation as the solvers did it before packed states.
+    indexOfZero = v.index(0)
+    i, j = divmod(indexOfZero, 3)
+    neighbours = []
+    for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        new_i, new_j = i + di, j + dj
+        if 0 <= new_i < 3 and 0 <= new_j < 3:
+            new_index = new_i * 3 + new_j
+            new_state = v.copy()
+            new_state[indexOfZero], new_state[new_index] = new_state[new_index], new_state[indexOfZero]
+            neighbours.append(new_state)
+    return neighbours
+
+
+def _legacy_bfs(start):
+    goal = list(range(9))
+    frontier = Queue()
+    frontier.put(start)
+    visited = {tuple(start)}
+    g_n = {tuple(start): 0}
+    Parent = {tuple(start): None}
+    expanded = 0
+    while not frontier.empty():
+        v = frontier.get()
+        expanded += 1
+        if v == goal:
+            return expanded, g_n[tuple(v)]
+        for neighbour in _legacy_neighbours(v):
+            t = tuple(neighbour)
+            if t not in visited:
+                g_n[t] = g_n[tuple(v)] + 1
+                Parent[t] = v
+                frontier.put(neighbour)
+                visited.add(t)
+
+
+def _legacy_astar(start):
+    from A_star import manhattan_distance
+    goal = list(range(9))
+    frontier = [(0, start)]
+    visited = set()
+    Parent = {tuple(start): None}
+    g_n = {tuple(start): 0}
+    expanded = 0
+    while frontier:
+        f, v = heapq.heappop(frontier)
+        visited.add(tuple(v))
+        expanded += 1
+        if v == goal:
+            return expanded, g_n[tuple(v)]
+        for neighbour in _legacy_neighbours(v):
+            t = tuple(neighbour)
+            if t not in visited:
+                g_neighbour = g_n[tuple(v)] + 1
+                if t not in g_n or g_n[t] > g_neighbour:
+                    Parent[t] = v
+                    heapq.heappush(frontier, (manhattan_distance(neighbour, goal) + g_neighbour, neighbour))
+                    g_n[t] = g_neighbour
+
+
+def _packed_bfs(start):
+    from BFS import BFS
+    parent, expanded, cost, depth = BFS(start)
+    return expanded, cost
+
+
+def _queue_bfs(start):
+    # Packed-state BFS as it was before the level-synchronous rewrite:
+    # queue.Queue frontier, visited set, g_n depths and a packed Parent dict.
+    from packed_state import neighbours, pack
+    s, target = pack(start), pack(list(range(9)))
+    frontier = Queue()
+    frontier.put(s)
+    visited = {s}
+    g_n = {s: 0}
+    Parent = {s: None}
+    expanded = 0
+    while not frontier.empty():
+        v = frontier.get()
+        expanded += 1
+        if v == target:
+            return expanded, g_n[v]
+        for neighbour in neighbours(v):
+            if neighbour not in visited:
+                g_n[neighbour] = g_n[v] + 1
+                Parent[neighbour] = v
+                frontier.put(neighbour)
+                visited.add(neighbour)
+
+
+def _packed_astar(start):
+    from A_star import A_Star, manhattan_distance
+    parent, expanded, cost, depth = A_Star(start, manhattan_distance)
+    return expanded, cost
+
+
+ENCODING_RUNS = {
+    ("list", "BFS"): _legacy_bfs,
+    ("list", "A*"): _legacy_astar,
+    ("packed", "BFS"): _packed_bfs,
+    ("packed", "A*"): _packed_astar,
+    ("queue", "BFS"): _queue_bfs,
+    ("level", "BFS"): _packed_bfs,
+}
+
+
+def _measure(encoding, algorithm, start):
+    # Runs in a child process so ru_maxrss is the peak of this search alone.
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    begin = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expanded, cost = ENCODING_RUNS[(encoding, algorithm)](start)
+    elapsed = time.perf_counter() - begin
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"expanded": expanded, "cost": cost, "time": elapsed,
+            "peak_rss_kb": peak_rss, "search_rss_kb": peak_rss - base_rss}
+
+
+def _measure_in_child(encoding, algorithm, start):
+    code = ("import json, sys, benchmark; "
+            "print(json.dumps(benchmark._measure(sys.argv[1], sys.argv[2], json.loads(sys.argv[3]))))")
+    result = subprocess.run([sys.executable, "-c", code, encoding, algorithm, json.dumps(start)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def bench_encoding():
+    """Compare list/tuple states against packed-int states on 31-move boards."""
+    print(f"{'algorithm':<10} {'state':<28} {'encoding':<8} {'expanded':>9} "
+          f"{'time':>8} {'nodes/s':>10} {'peak RSS':>10} {'search RSS':>11}")
+    for algorithm in ("BFS", "A*"):
+        for start in HARDEST:
+            for encoding in ("list", "packed"):
+                r = _measure_in_child(encoding, algorithm, start)
+                assert r["cost"] == 31, r
+                print(f"{algorithm:<10} {str(start):<28} {encoding:<8} {r['expanded']:>9} "
+                      f"{r['time']:>7.3f}s {r['expanded'] / r['time']:>10.0f} "
+                      f"{r['peak_rss_kb'] / 1024:>8.1f}MB {r['search_rss_kb'] / 1024:>9.1f}MB")
+
+
+def bench_bfs():
+    """queue.Queue BFS against the level-synchronous BFS over (nearly) the whole 3x3 space."""
+    # From a 31-move board BFS expands 181439 of the 181440 reachable states.
+    print(f"{'state':<28} {'frontier':<8} {'expanded':>9} {'time':>8} {'nodes/s':>10} "
+          f"{'peak RSS':>10} {'search RSS':>11}")
+    for start in HARDEST:
+        for engine in ("queue", "level"):
+            r = _measure_in_child(engine, "BFS", start)
+            assert r["cost"] == 31, r
+            print(f"{str(start):<28} {engine:<8} {r['expanded']:>9} {r['time']:>7.3f}s "
+                  f"{r['expanded'] / r['time']:>10.0f} {r['peak_rss_kb'] / 1024:>8.1f}MB "
+                  f"{r['search_rss_kb'] / 1024:>9.1f}MB")
+
+
+DEPTH_BUCKETS = [(0, 9), (10, 14), (15, 19), (20, 24), (25, 31)]
+
+
+def depth_bucketed_states(per_bucket=5, seed=0):
+    """{(low, high): boards whose optimal length is in that range}, from random walks."""
+    import random
+    import state_database
+    from packed_state import neighbours, pack, unpack
+
+    table = state_database.load_database()
+    buckets = {bucket: [] for bucket in DEPTH_BUCKETS}
+    for start in HARDEST:
+        buckets[DEPTH_BUCKETS[-1]].append(start)
+    rng = random.Random(seed)
+    while any(len(states) < per_bucket for states in buckets.values()):
+        v = pack(list(range(9)))
+        for _ in range(rng.randint(5, 200)):
+            v = rng.choice(neighbours(v))
+        state = unpack(v)
+        d = state_database.distance(state, table)
+        for (low, high), states in buckets.items():
+            if low <= d <= high and len(states) < per_bucket and state not in states:
+                states.append(state)
+    return buckets
+
+
+def bench_bibfs():
+    """BFS against bidirectional BFS: expanded nodes and time per optimal-depth bucket."""
+    from BFS import BFS, Bidirectional_BFS
+
+    print(f"{'depth':<7} {'boards':>6} {'BFS expanded':>13} {'bi expanded':>12} {'ratio':>7} "
+          f"{'BFS time':>9} {'bi time':>8} {'speedup':>8}")
+    for (low, high), states in depth_bucketed_states().items():
+        totals = {}
+        for name, search in (("BFS", BFS), ("bi", Bidirectional_BFS)):
+            expanded = 0
+            begin = time.perf_counter()
+            for start in states:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, e, cost, _ = search(start)
+                expanded += e
+            totals[name] = (expanded, time.perf_counter() - begin)
+        (bfs_e, bfs_t), (bi_e, bi_t) = totals["BFS"], totals["bi"]
+        print(f"{low:>2}-{high:<4} {len(states):>6} {bfs_e:>13} {bi_e:>12} {bfs_e / bi_e:>6.0f}x "
+              f"{bfs_t:>8.3f}s {bi_t:>7.3f}s {bfs_t / bi_t:>7.0f}x")
+
+
+def bench_symmetry(count=200):
+    """A* over boards plus their mirror images, with and without the solution cache."""
+    import random
+    from solution_cache import SolutionCache
+    from solve import solve
+    from symmetry import transpose
+
+    states = random_walk_states(count, seed=1)
+    corpus = states + [transpose(state) for state in states]
+    random.Random(0).shuffle(corpus)
+    print(f"{len(corpus)} boards ({count} mirror-image pairs), A* Manhattan")
+    print(f"{'mode':<10} {'searches':>9} {'expanded':>9} {'time':>8}")
+    for name, cache in (("no cache", None), ("cache", SolutionCache(maxsize=len(corpus)))):
+        searches = expanded = 0
+        begin = time.perf_counter()
+        for start in corpus:
+            with contextlib.redirect_stdout(io.StringIO()):
+                path, stats = solve(start, "astar", "manhattan", cache)
+            if not stats.get("cached"):
+                searches += 1
+                expanded += stats["expanded"]
+        print(f"{name:<10} {searches:>9} {expanded:>9} {time.perf_counter() - begin:>7.3f}s")
+
+
+def bench_smastar():
+    """SMA* on the 31-move boards under shrinking node budgets."""
+    from SMA_star import SMA_Star
+
+    print(f"{'state':<28} {'max nodes':>9} {'cost':>5} {'expanded':>9} {'peak':>7} "
+          f"{'regenerated':>11} {'time':>8}")
+    for start in HARDEST:
+        for max_nodes in (100000, 10000, 2000, 500):
+            begin = time.perf_counter()
+            parent, expanded, cost, depth, peak, regenerated = SMA_Star(start, max_nodes=max_nodes)
+            elapsed = time.perf_counter() - begin
+            assert cost == 31 and peak <= max_nodes
+            print(f"{str(start):<28} {max_nodes:>9} {cost:>5} {expanded:>9} {peak:>7} "
+                  f"{regenerated:>11} {elapsed:>7.3f}s")
+
+
+def _reexpanding_astar(start, heuristic):
+    # Packed-state A* as it was before closing states on pop: (F, State, H)
+    # entries, and a state popped again after a cheaper path was found is
+    # expanded again. Returns (expanded, cost, re-expansions, heap peak).
+    from A_star import tile_table
+    from packed_state import moves, pack
+
+    goal = list(range(9))
+    table = tile_table(heuristic, goal)
+    s, target = pack(start), pack(goal)
+    h_start = heuristic(start, goal)
+    frontier = [(h_start, s, h_start)]
+    visited = set()
+    g_n = {s: 0}
+    expanded = reexpanded = 0
+    peak = 1
+    while frontier:
+        f, v, h = heapq.heappop(frontier)
+        if v in visited:
+            reexpanded += 1
+        visited.add(v)
+        expanded += 1
+        if v == target:
+            return expanded, g_n[v], reexpanded, peak
+        for neighbour, tile, source, dest in moves(v):
+            if neighbour not in visited:
+                g = g_n[v] + 1
+                if neighbour not in g_n or g_n[neighbour] > g:
+                    h_neighbour = h + table[tile][dest] - table[tile][source]
+                    heapq.heappush(frontier, (g + h_neighbour, neighbour, h_neighbour))
+                    g_n[neighbour] = g
+        peak = max(peak, len(frontier))
+
+
+def bench_openlist():
+    """A* open list: old re-expanding heap vs closed-on-pop heapq vs indexed heap (Manhattan)."""
+    from A_star import A_Star, manhattan_distance
+
+    print(f"{'state':<28} {'open list':<12} {'expanded':>9} {'stale':>6} {'heap peak':>9} {'time':>8}")
+    for start in DEEPENING_INSTANCES + HARDEST:
+        begin = time.perf_counter()
+        expanded, cost, stale, peak = _reexpanding_astar(start, manhattan_distance)
+        elapsed = time.perf_counter() - begin
+        print(f"{str(start):<28} {'old':<12} {expanded:>9} {stale:>6} {peak:>9} {elapsed:>7.3f}s")
+        for name, indexed in (("heapq", False), ("indexed", True)):
+            stats = {}
+            begin = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, expanded, new_cost, _ = A_Star(start, manhattan_distance, indexed=indexed, stats=stats)
+            elapsed = time.perf_counter() - begin
+            assert new_cost == cost
+            print(f"{str(start):<28} {name:<12} {expanded:>9} {stats['stale_pops']:>6} "
+                  f"{stats['heap_peak']:>9} {elapsed:>7.3f}s")
+
+
+def bench_buckets():
+    """A* open list: heapq vs the (f, h) bucket queue, on 8-puzzle and 15-puzzle boards."""
+    from A_star import A_Star, manhattan_distance
+    from pattern_database import PDB_4_4
+
+    runs = [("Manhattan", manhattan_distance, DEEPENING_INSTANCES + HARDEST),
+            ("PDB 4-4", PDB_4_4.load(), DEEPENING_INSTANCES + HARDEST),
+            ("Manhattan", manhattan_distance, random_walk_states(3, steps=80, seed=1, cols=4))]
+    print(f"{'board':<6} {'heuristic':<10} {'open list':<9} {'expanded':>9} {'heap peak':>9} {'time':>8}")
+    for name, heuristic, instances in runs:
+        size = f"{len(instances[0]) - 1}"
+        for open_list, buckets in (("heapq", False), ("buckets", True)):
+            expanded = peak = 0
+            begin = time.perf_counter()
+            for start in instances:
+                stats = {}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, count, _, _ = A_Star(start, heuristic, buckets=buckets, stats=stats)
+                expanded += count
+                peak = max(peak, stats['heap_peak'])
+            elapsed = time.perf_counter() - begin
+            print(f"{size:<6} {name:<10} {open_list:<9} {expanded:>9} {peak:>9} {elapsed:>7.3f}s")
+
+
+def bench_vectorized():
+    """States expanded per second: NumPy layer/batch expansion vs the packed-int solvers."""
+    try:
+        from vectorized import Vectorized_A_Star, Vectorized_BFS
+    except ImportError:
+        print("numpy is not installed; skipped")
+        return
+    from A_star import A_Star, manhattan_distance
+    from BFS import BFS
+
+    walks = random_walk_states(3, steps=80, seed=1, cols=4)
+    runs = [("BFS", BFS, HARDEST), ("BFS", Vectorized_BFS, HARDEST),
+            ("A*", lambda start: A_Star(start, manhattan_distance), DEEPENING_INSTANCES + HARDEST),
+            ("A*", Vectorized_A_Star, DEEPENING_INSTANCES + HARDEST),
+            ("A* 4x4", lambda start: A_Star(start, manhattan_distance), walks),
+            ("A* 4x4", Vectorized_A_Star, walks)]
+    print(f"{'search':<8} {'engine':<10} {'expanded':>9} {'time':>8} {'states/s':>10}")
+    for name, search, instances in runs:
+        engine = "numpy" if search in (Vectorized_BFS, Vectorized_A_Star) else "packed"
+        expanded = 0
+        begin = time.perf_counter()
+        for start in instances:
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, count, _, _ = search(start)
+            expanded += count
+        elapsed = time.perf_counter() - begin
+        print(f"{name:<8} {engine:<10} {expanded:>9} {elapsed:>7.3f}s {expanded / elapsed:>10.0f}")
+
+
+# Boards at increasing optimal depth (12, 16, 20, 23 moves).
+DEEPENING_INSTANCES = [
+    [3, 7, 0, 4, 8, 1, 6, 5, 2],
+    [3, 1, 7, 6, 5, 2, 0, 8, 4],
+    [4, 7, 6, 1, 0, 5, 3, 8, 2],
+    [1, 0, 2, 7, 5, 4, 8, 6, 3],
+]
+
+
+def bench_idastar():
+    """Compare IDFS with IDA* (in-place moves, Manhattan bound)."""
+    import IDA_star
+    import IDFS
+
+    def run_idfs(start):
+        stats = {}
+        path, depth = IDFS.IDFS(start, stats=stats)
+        return path, stats['expanded']
+
+    def run_idastar(start):
+        path, depth, expanded = IDA_star.IDA_Star(start)
+        return path, expanded
+
+    print(f"{'state':<28} {'solver':<6} {'cost':>5} {'expanded':>9} {'time':>9} {'nodes/s':>10}")
+    for start in DEEPENING_INSTANCES:
+        for name, run in (("IDFS", run_idfs), ("IDA*", run_idastar)):
+            begin = time.perf_counter()
+            path, expanded = run(start)
+            elapsed = time.perf_counter() - begin
+            print(f"{str(start):<28} {name:<6} {len(path) - 1:>5} {expanded:>9} "
+                  f"{elapsed:>8.3f}s {expanded / elapsed:>10.0f}")
+
+
+def _recursive_idfs(start):
+    # IDFS as it was before the explicit-stack DLS: one Python call per
+    # state and a new path list (path + [neighbour]) per child. Returns
+    # (path of packed states, expanded).
+    import sys
+    from packed_state import neighbours, pack
+
+    target = pack(list(range(9)))
+    expanded = 0
+
+    def dfs(node, depth, path):
+        nonlocal expanded
+        if node == target:
+            return path
+        if depth == 0:
+            return None
+        expanded += 1
+        for neighbour in neighbours(node):
+            if neighbour not in path:
+                result = dfs(neighbour, depth - 1, path + [neighbour])
+                if result:
+                    return result
+        return None
+
+    s = pack(start)
+    for depth in range(50):
+        if depth + 50 > sys.getrecursionlimit():
+            raise RecursionError(f"depth limit {depth} is too close to the recursion limit")
+        result = dfs(s, depth, [s])
+        if result:
+            return result, expanded
+
+
+def bench_idfs():
+    """Recursive IDFS against the explicit-stack DLS core: nodes expanded per second."""
+    import IDFS
+
+    def run_stack(start):
+        stats = {}
+        path, depth = IDFS.IDFS(start, stats=stats)
+        return path, stats['expanded']
+
+    print(f"{'state':<28} {'engine':<10} {'cost':>5} {'expanded':>9} {'time':>9} {'nodes/s':>10}")
+    for start in DEEPENING_INSTANCES[:3]:
+        rates = []
+        for name, run in (("recursive", _recursive_idfs), ("stack", run_stack)):
+            begin = time.perf_counter()
+            path, expanded = run(start)
+            elapsed = time.perf_counter() - begin
+            rates.append(expanded / elapsed)
+            print(f"{str(start):<28} {name:<10} {len(path) - 1:>5} {expanded:>9} "
+                  f"{elapsed:>8.3f}s {rates[-1]:>10.0f}")
+        print(f"{'':<28} {'speedup':<10} {rates[1] / rates[0]:>26.2f}x")
+
+
+def bench_heuristic(samples=50000):
+    """Heuristic evaluations/second: full board evaluation vs incremental update."""
+    import random
+    from A_star import euclidean_distance, goal, manhattan_distance, tile_table
+    from packed_state import moves, pack, unpack
+
+    # Children of the states along a random walk, as A_Star sees them.
+    rng = random.Random(0)
+    v = pack(HARDEST[0])
+    children = []
+    while len(children) < samples:
+        options = moves(v)
+        children.extend(options)
+        v = rng.choice(options)[0]
+    children = children[:samples]
+    boards = [unpack(child) for child, _, _, _ in children]
+
+    print(f"{'heuristic':<10} {'mode':<12} {'evals/s':>12}")
+    for name, heuristic in (("Manhattan", manhattan_distance), ("Euclidean", euclidean_distance)):
+        begin = time.perf_counter()
+        for board in boards:
+            heuristic(board, goal)
+        full = samples / (time.perf_counter() - begin)
+
+        table = tile_table(heuristic, goal)
+        h = 0
+        begin = time.perf_counter()
+        for child, tile, source, dest in children:
+            h = h + table[tile][dest] - table[tile][source]
+        incremental = samples / (time.perf_counter() - begin)
+
+        print(f"{name:<10} {'full':<12} {full:>12.0f}")
+        print(f"{name:<10} {'incremental':<12} {incremental:>12.0f}  ({incremental / full:.0f}x)")
+
+
+def bench_pdb():
+    """Nodes expanded and wall time per heuristic for A* and IDA*."""
+    from A_star import A_Star, euclidean_distance, manhattan_distance
+    from IDA_star import IDA_Star
+    from pattern_database import PDB_3_5, PDB_4_4
+
+    heuristics = [("Manhattan", manhattan_distance), ("Euclidean", euclidean_distance),
+                  ("PDB 4-4", PDB_4_4.load()), ("PDB 3-5", PDB_3_5.load())]
+    instances = DEEPENING_INSTANCES + HARDEST
+
+    def run_astar(start, heuristic):
+        with contextlib.redirect_stdout(io.StringIO()):
+            parent, expanded, cost, depth = A_Star(start, heuristic)
+        return cost, expanded
+
+    def run_idastar(start, heuristic):
+        path, depth, expanded = IDA_Star(start, heuristic=heuristic)
+        return len(path) - 1, expanded
+
+    optimal = [12, 16, 20, 23, 31, 31]
+    print(f"{'solver':<6} {'heuristic':<10} {'expanded':>10} {'time':>9}   per instance (expanded)")
+    for solver, run in (("A*", run_astar), ("IDA*", run_idastar)):
+        for name, heuristic in heuristics:
+            counts = []
+            total_time = 0.0
+            for start, length in zip(instances, optimal):
+                begin = time.perf_counter()
+                cost, expanded = run(start, heuristic)
+                total_time += time.perf_counter() - begin
+                assert cost == length, (solver, name, start, cost)
+                counts.append(expanded)
+            print(f"{solver:<6} {name:<10} {sum(counts):>10} {total_time:>8.3f}s   {counts}")
+
+
+def random_walk_states(count, steps=60, seed=0, cols=3):
+    """count solvable cols x cols boards, each a random walk of steps moves from the goal."""
+    import random
+    from packed_state import packed_board
+
+    packed = packed_board(cols, cols)
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        v = packed.pack(list(range(cols * cols)))
+        for _ in range(steps):
+            v = rng.choice(packed.neighbours(v))
+        states.append(packed.unpack(v))
+    return states
+
+
+def bench_batch(count=400):
+    """Wall time of batch.solve_batch (A*, Manhattan) against the number of worker processes."""
+    import os
+    from batch import solve_batch
+
+    puzzles = [(None, state, None) for state in random_walk_states(count)]
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    print(f"{count} boards, {cpus} CPUs")
+    print(f"{'processes':>9} {'time':>9} {'boards/s':>9} {'speedup':>8}")
+    base = None
+    for processes in workers:
+        begin = time.perf_counter()
+        results = list(solve_batch(puzzles, "astar", processes=processes))
+        elapsed = time.perf_counter() - begin
+        assert len(results) == count and not any("error" in r for r in results)
+        base = base or elapsed
+        print(f"{processes:>9} {elapsed:>8.3f}s {count / elapsed:>9.0f} {base / elapsed:>7.2f}x")
+
+
+def bench_hda():
+    """Wall time of hash-distributed A* (Manhattan, 15-puzzle walks) against the number of workers."""
+    import os
+    from A_star import A_Star, manhattan_distance
+    from hda_star import HDA_Star
+
+    instances = random_walk_states(3, steps=80, seed=1, cols=4)
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, cpus} & set(range(1, cpus + 1)))
+    print(f"{len(instances)} boards, {cpus} CPUs")
+    print(f"{'workers':>7} {'expanded':>9} {'time':>9} {'speedup':>8}")
+
+    def run(search):
+        expanded = 0
+        begin = time.perf_counter()
+        for start in instances:
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, count, _, _ = search(start)
+            expanded += count
+        return expanded, time.perf_counter() - begin
+
+    expanded, base = run(lambda start: A_Star(start, manhattan_distance))
+    print(f"{'A*':>7} {expanded:>9} {base:>8.3f}s {1:>7.2f}x")
+    for workers in counts:
+        expanded, elapsed = run(lambda start: HDA_Star(start, workers=workers))
+        print(f"{workers:>7} {expanded:>9} {elapsed:>8.3f}s {base / elapsed:>7.2f}x")
+
+
+def bench_suite():
+    """Every solve.py algorithm on the depth-stratified corpus (see benchmark_suite.py)."""
+    import benchmark_suite
+
+    benchmark_suite.main(["run"])
+
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "encoding": bench_encoding,
+    "idastar": bench_idastar,
+    "heuristic": bench_heuristic,
+    "pdb": bench_pdb,
+    "batch": bench_batch,
+    "bfs": bench_bfs,
+    "bibfs": bench_bibfs,
+    "symmetry": bench_symmetry,
+    "smastar": bench_smastar,
+    "openlist": bench_openlist,
+    "buckets": bench_buckets,
+    "vectorized": bench_vectorized,
+    "hda": bench_hda,
+    "suite": bench_suite,
+    "idfs": bench_idfs,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run solver benchmarks.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS) + ["all"])
+    args = parser.parse_args(argv)
+
+    names = sorted(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    for name in names:
+        print(f"== {name} ==")
+        start = time.perf_counter()
+        BENCHMARKS[name]()
+        print(f"({time.perf_counter() - start:.2f}s)\n")
+
+
+if __name__ == "__main__":
+    main()
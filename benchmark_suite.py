@@ -0,0 +1,290 @@
+"""
+Benchmark suite: every solve.py algorithm on a fixed corpus of 8-puzzle
+boards, stratified by optimal solution length.
+
+corpus_3x3.txt holds CORPUS_PER_DEPTH boards for each length 0-31 (fewer
+where fewer exist: one board at 0, two at 1 and at 31), drawn from
+state_database with a fixed seed. It is checked in so results stay
+comparable across commits; `corpus` rewrites it.
+
+Each solver first runs once on a board with an Instrument (see
+instrumentation.py); that warmup run also loads any table the solver needs,
+and gives the expanded count, the peak traced memory and the path, which is
+checked for being a legal sequence of moves and for optimal length. The
+board is then solved `repeat` more times without instrumentation and timed
+with time.perf_counter; a board's time is the median of those runs.
+Tracing memory slows the warmup runs severalfold and takes most of a full
+run (about 20 minutes); --no-memory skips it.
+
+    python benchmark_suite.py run --json results.json
+    python benchmark_suite.py run --no-memory --repeat 1
+    python benchmark_suite.py run -s astar/manhattan -s idastar/pdb44 --repeat 5
+    python benchmark_suite.py run --compare old.json --json new.json
+    python benchmark_suite.py corpus
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from board import apply_moves, dimensions, goal_state, path_moves
+from instrumentation import Instrument
+from solve import solve
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_3x3.txt")
+CORPUS_PER_DEPTH = 3
+CORPUS_SEED = 2024
+MAX_DEPTH = 31  # the longest optimal 8-puzzle solution
+DEPTH_BANDS = [(0, 9), (10, 14), (15, 19), (20, 24), (25, 31)]
+
+# (algorithm, heuristic or None, deepest board it is run on). IDFS explores
+# about 3x more nodes per extra move and takes minutes beyond 20.
+SOLVERS = [
+    ("bfs", None, MAX_DEPTH),
+    ("bibfs", None, MAX_DEPTH),
+    ("dfs", None, MAX_DEPTH),
+    ("idfs", None, 20),
+    ("astar", "manhattan", MAX_DEPTH),
+    ("astar", "euclidean", MAX_DEPTH),
+    ("astar", "pdb44", MAX_DEPTH),
+    ("astar", "pdb35", MAX_DEPTH),
+    ("idastar", "manhattan", MAX_DEPTH),
+    ("idastar", "pdb44", MAX_DEPTH),
+    ("smastar", "manhattan", MAX_DEPTH),
+    ("database", None, MAX_DEPTH),
+]
+
+
+def solver_name(algorithm, heuristic):
+    return f"{algorithm}/{heuristic}" if heuristic else algorithm
+
+
+def make_corpus(per_depth=CORPUS_PER_DEPTH, seed=CORPUS_SEED):
+    """[(id, depth, state)] with up to per_depth distinct boards at each optimal length."""
+    import state_database
+    from collections import Counter
+    from instances import states_at_distance
+
+    table = state_database.load_database()
+    available = Counter(table[:])
+    corpus = []
+    for depth in range(MAX_DEPTH + 1):
+        count = min(per_depth, available[depth])
+        for i, state in enumerate(states_at_distance(depth, count, seed + depth, table)):
+            corpus.append((f"d{depth:02}-{i}", depth, state))
+    return corpus
+
+
+def write_corpus(corpus, path=CORPUS_PATH):
+    with open(path, "w") as f:
+        f.write("# 8-puzzle boards by optimal length; rewrite with: python benchmark_suite.py corpus\n")
+        for puzzle_id, depth, state in corpus:
+            f.write(json.dumps({"id": puzzle_id, "depth": depth, "state": state}) + "\n")
+
+
+def read_corpus(path=CORPUS_PATH):
+    """[(id, depth, state)] from a corpus file; the lines are also valid batch.py input."""
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entry = json.loads(line)
+                corpus.append((entry["id"], entry["depth"], entry["state"]))
+    return corpus
+
+
+def is_legal_path(path, start):
+    """path runs from start to the goal one slide of the blank at a time."""
+    path = [list(state) for state in path or []]
+    if not path or path[0] != start or path[-1] != goal_state(*dimensions(start)):
+        return False
+    # Replaying the path's own moves gives it back only if every step is one slide
+    try:
+        return apply_moves(start, path_moves(path)) == path
+    except ValueError:
+        return False
+
+
+def run_one(start, depth, algorithm, heuristic, repeat, memory=True):
+    """Warmup (instrumented) run plus repeat timed runs of one solver on one board."""
+    instrument = Instrument(memory=memory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        path, stats = solve(start, algorithm, heuristic or "manhattan", instrument=instrument)
+    times = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            begin = time.perf_counter()
+            solve(start, algorithm, heuristic or "manhattan")
+            times.append(time.perf_counter() - begin)
+    elapsed = statistics.median(times) if times else stats['time']
+    length = len(path) - 1 if path else None
+    expanded = stats['expanded'] or 0
+    return {
+        'length': length,
+        'optimal': length == depth and is_legal_path(path, start),
+        'expanded': expanded,
+        'memory_peak': stats['instrumentation']['memory_peak'],
+        'times': times,
+        'time': elapsed,
+        'nodes_per_second': expanded / elapsed if elapsed > 0 else None,
+    }
+
+
+def run_suite(corpus, solvers=SOLVERS, repeat=3, progress=None, memory=True):
+    """One result dict per (solver, board); boards deeper than a solver's limit are skipped."""
+    results = []
+    for algorithm, heuristic, max_depth in solvers:
+        for puzzle_id, depth, state in corpus:
+            if depth > max_depth:
+                continue
+            result = run_one(state, depth, algorithm, heuristic, repeat, memory)
+            results.append({'solver': solver_name(algorithm, heuristic), 'id': puzzle_id,
+                            'depth': depth, **result})
+            if progress is not None:
+                progress(results[-1])
+    return results
+
+
+def _band(depth):
+    return next(band for band in DEPTH_BANDS if band[0] <= depth <= band[1])
+
+
+def summarize(results):
+    """{(solver, band): totals} over the boards of each optimal-depth band."""
+    summary = {}
+    for r in results:
+        s = summary.setdefault((r['solver'], _band(r['depth'])), {
+            'boards': 0, 'optimal': 0, 'expanded': 0, 'time': 0.0, 'memory_peak': None})
+        s['boards'] += 1
+        s['optimal'] += r['optimal']
+        s['expanded'] += r['expanded']
+        s['time'] += r['time']
+        if r['memory_peak'] is not None:
+            s['memory_peak'] = max(s['memory_peak'] or 0, r['memory_peak'])
+    return summary
+
+
+def print_table(results, out=None):
+    print(f"{'solver':<18} {'depth':<6} {'boards':>6} {'optimal':>7} {'expanded':>10} "
+          f"{'time/board':>11} {'nodes/s':>10} {'peak mem':>9}", file=out)
+    for (solver, (low, high)), s in summarize(results).items():
+        rate = s['expanded'] / s['time'] if s['time'] > 0 else 0
+        memory = "-" if s['memory_peak'] is None else f"{s['memory_peak'] / 2 ** 20:.2f}MB"
+        print(f"{solver:<18} {low:>2}-{high:<3} {s['boards']:>6} {s['optimal']:>3}/{s['boards']:<3} "
+              f"{s['expanded'] // s['boards']:>10} {s['time'] / s['boards'] * 1000:>9.2f}ms "
+              f"{rate:>10.0f} {memory:>9}", file=out)
+
+
+def print_comparison(old, results, out=None):
+    """Time ratio per solver against an earlier JSON report, and boards whose
+    expanded count or path length changed."""
+    before = {(r['solver'], r['id']): r for r in old['results']}
+    print(f"against {old.get('commit') or 'previous run'} ({old.get('date', '?')})", file=out)
+    print(f"{'solver':<18} {'boards':>6} {'old time':>9} {'new time':>9} {'ratio':>6} {'changed':>8}", file=out)
+    totals = {}
+    for r in results:
+        previous = before.get((r['solver'], r['id']))
+        if previous is None:
+            continue
+        t = totals.setdefault(r['solver'], [0, 0.0, 0.0, 0])
+        t[0] += 1
+        t[1] += previous['time']
+        t[2] += r['time']
+        t[3] += (previous['expanded'], previous['length']) != (r['expanded'], r['length'])
+    for solver, (boards, old_time, new_time, changed) in totals.items():
+        print(f"{solver:<18} {boards:>6} {old_time:>8.3f}s {new_time:>8.3f}s "
+              f"{new_time / old_time if old_time else 0:>5.2f}x {changed:>8}", file=out)
+
+
+def _commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def report(results, repeat, corpus_path):
+    """The machine-readable form written by --json."""
+    return {
+        'commit': _commit(),
+        'date': datetime.datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': os.path.basename(corpus_path),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the solvers on a corpus of 8-puzzle boards.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and print a comparison table")
+    run.add_argument("--corpus", default=CORPUS_PATH, help="corpus file (default: corpus_3x3.txt)")
+    run.add_argument("-s", "--solver", action="append", metavar="NAME",
+                     help="only this solver, e.g. astar/pdb44 (repeatable; default: all)")
+    run.add_argument("--repeat", type=int, default=3, help="timed runs per board after the warmup (default 3)")
+    run.add_argument("--max-depth", type=int, default=MAX_DEPTH, help="skip boards deeper than this")
+    run.add_argument("--no-memory", dest="memory", action="store_false",
+                     help="do not trace peak memory (much faster warmup runs)")
+    run.add_argument("--json", metavar="FILE", help="also write every result as JSON")
+    run.add_argument("--compare", metavar="FILE", help="JSON from an earlier run to compare against")
+    corpus = commands.add_parser("corpus", help="rewrite the corpus file")
+    corpus.add_argument("-n", "--per-depth", type=int, default=CORPUS_PER_DEPTH)
+    corpus.add_argument("--seed", type=int, default=CORPUS_SEED)
+    corpus.add_argument("-o", "--output", default=CORPUS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "corpus":
+        boards = make_corpus(args.per_depth, args.seed)
+        write_corpus(boards, args.output)
+        print(f"{len(boards)} boards written to {args.output}")
+        return 0
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    solvers = SOLVERS
+    if args.solver:
+        names = {solver_name(a, h): (a, h, d) for a, h, d in SOLVERS}
+        unknown = [name for name in args.solver if name not in names]
+        if unknown:
+            parser.error(f"unknown solver {', '.join(unknown)}; choose from {', '.join(names)}")
+        solvers = [names[name] for name in args.solver]
+    boards = [entry for entry in read_corpus(args.corpus) if entry[1] <= args.max_depth]
+    old = None
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+
+    def progress(result):
+        print(f"\r{result['solver']:<18} {result['id']}", end="", file=sys.stderr, flush=True)
+
+    tty = sys.stderr.isatty()
+    results = run_suite(boards, solvers, args.repeat, progress if tty else None, args.memory)
+    if tty:
+        print("\r" + " " * 30 + "\r", end="", file=sys.stderr)
+    print_table(results)
+    if old is not None:
+        print()
+        print_comparison(old, results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report(results, args.repeat, args.corpus), f, indent=1)
+    if not all(r['optimal'] for r in results if not r['solver'].startswith("dfs")):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Board geometry shared by the solvers.
+
+Boards are flat lists read row by row, with 0 for the blank and
+goal = [0, 1, ..., cols * rows - 1]. The solvers take the board size from
+the length of the start state, so the same code runs the 8-puzzle (3x3),
+the 15-puzzle (4x4) and the 24-puzzle (5x5). Helpers that need the shape
+take cols/rows explicitly and default to a square board.
+
+A solution can also be written as a move string ("RDLU..."), which
+apply_moves replays into the list of states.
+"""
+
+from functools import lru_cache
+from math import isqrt
+
+
+def dimensions(state, cols=None):
+    """Return (cols, rows) for a flat board, assuming a square one unless cols is given."""
+    size = len(state)
+    if cols is None:
+        cols = isqrt(size)
+    rows = size // cols if cols else 0
+    if cols < 2 or rows < 2 or cols * rows != size:
+        raise ValueError(f"A board of {size} tiles is not a supported puzzle size")
+    return cols, rows
+
+
+def goal_state(cols, rows=None):
+    return list(range(cols * (rows or cols)))
+
+
+@lru_cache(maxsize=None)
+def adjacent(cols, rows):
+    """adjacent[pos] = neighbouring positions, in up, down, left, right order."""
+    result = []
+    for pos in range(cols * rows):
+        i, j = divmod(pos, cols)
+        result.append(tuple(ni * cols + nj
+                            for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                            if 0 <= ni < rows and 0 <= nj < cols))
+    return tuple(result)
+
+
+def permutation_parity(state):
+    """Parity (0 even, 1 odd) of state as a permutation of 0..n-1, from its cycles in O(n)."""
+    seen = [False] * len(state)
+    cycles = 0
+    for i in range(len(state)):
+        if not seen[i]:
+            cycles += 1
+            while not seen[i]:
+                seen[i] = True
+                i = state[i]
+    return (len(state) - cycles) % 2
+
+
+def is_solvable(state, cols=None):
+    """Whether state can reach goal_state, in O(n) for any board size.
+
+    A move swaps the blank with a neighbour, which flips the parity of the
+    whole board as a permutation and moves the blank one step, flipping the
+    parity of its row + column as well. The goal has both even, so a board
+    is solvable exactly when the two parities agree (and every such board is).
+    """
+    cols, rows = dimensions(state, cols)
+    row, col = divmod(state.index(0), cols)
+    return permutation_parity(state) == (row + col) % 2
+
+
+def format_board(state, cols=None):
+    """Rows of the board as lists, for printing."""
+    cols, rows = dimensions(state, cols)
+    return [list(state[i * cols:(i + 1) * cols]) for i in range(rows)]
+
+
+# A move is named by the direction the blank goes: "U" swaps it with the tile
+# above, and so on. A solution is then a string such as "RDLU".
+MOVE_LETTERS = "UDLR"
+
+
+def move_letter(source, target, cols):
+    """Letter of the move taking the blank from index source to index target."""
+    if target == source - cols:
+        return "U"
+    if target == source + cols:
+        return "D"
+    return "L" if target == source - 1 else "R"
+
+
+def apply_move(state, move, cols=None):
+    """The board after one move of the blank (a new list); ValueError if it leaves the board."""
+    cols, rows = dimensions(state, cols)
+    blank = state.index(0)
+    row, col = divmod(blank, cols)
+    if move == "U" and row > 0:
+        target = blank - cols
+    elif move == "D" and row < rows - 1:
+        target = blank + cols
+    elif move == "L" and col > 0:
+        target = blank - 1
+    elif move == "R" and col < cols - 1:
+        target = blank + 1
+    else:
+        raise ValueError(f"Move {move!r} is not possible on this board")
+    result = list(state)
+    result[blank], result[target] = result[target], 0
+    return result
+
+
+def apply_moves(start, moves, cols=None):
+    """The states from start along a move string, start included."""
+    states = [list(start)]
+    for move in moves:
+        states.append(apply_move(states[-1], move, cols))
+    return states
+
+
+def path_moves(path, cols=None):
+    """Move string of a path given as a list of states."""
+    if not path:
+        return ""
+    cols, rows = dimensions(path[0], cols)
+    blanks = [list(state).index(0) for state in path]
+    return "".join(move_letter(a, b, cols) for a, b in zip(blanks, blanks[1:]))
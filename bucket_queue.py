@@ -0,0 +1,54 @@
+"""
+Two-level bucket queue for open lists with small integer priorities.
+
+With an integer heuristic every f-value in A* is a small non-negative
+integer, so the open list can be an array of buckets indexed by f, each an
+array of stacks indexed by h. Push appends to a stack and pop takes from the
+lowest non-empty one, so both are O(1) amortized and no tuples are compared.
+Within one f the lowest h (highest g) comes out first, as with the
+(f, h, state) entries of the heapq open list.
+"""
+
+
+class BucketQueue:
+    """Min-queue of items keyed by (f, h), both non-negative integers."""
+
+    def __init__(self):
+        self._buckets = []  # _buckets[f][h] = stack of items
+        self._size = 0
+        self._min = 0       # no non-empty stack below (_min, _min_h)
+        self._min_h = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, item, f, h):
+        buckets = self._buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        bucket = buckets[f]
+        while len(bucket) <= h:
+            bucket.append([])
+        bucket[h].append(item)
+        self._size += 1
+        if f < self._min or (f == self._min and h < self._min_h):
+            self._min = f
+            self._min_h = h
+
+    def pop(self):
+        """Remove and return (item, f, h) with the lowest f, then the lowest h."""
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        buckets = self._buckets
+        f, h = self._min, self._min_h
+        while True:
+            bucket = buckets[f]
+            while h < len(bucket):
+                stack = bucket[h]
+                if stack:
+                    self._size -= 1
+                    self._min, self._min_h = f, h
+                    return stack.pop(), f, h
+                h += 1
+            f += 1
+            h = 0
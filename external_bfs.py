@@ -0,0 +1,222 @@
+"""
+Breadth-first search with the levels kept on disk.
+
+BFS keeps every visited state in memory, which the 15-puzzle's 10^13
+states rule out. Here each level is a file of sorted fixed-width records
+(big-endian packed states, so byte order is numeric order). The next level
+is made by streaming the current one, generating children into a bounded
+buffer that is sorted and spilled to a run file whenever it fills, and then
+merging the runs while dropping every state found in the current or
+previous level (delayed duplicate detection: in a breadth-first search a
+child can only be new or on one of those two levels). Runs are merged at
+most MERGE_RUNS at a time, into new run files if there are more, so memory
+use is the buffer plus a bounded number of read blocks (and open files),
+whatever the size of the levels.
+
+Only the level files are needed to recover a path: walking back from the
+goal, any neighbour found (by binary search) in the level before is a
+parent.
+
+    python external_bfs.py check      # compare every 3x3 distance with state_database
+"""
+
+import heapq
+import os
+import sys
+import tempfile
+
+from board import goal_state
+from packed_state import PackedMap, board_for
+
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+DEFAULT_MAX_STATES = 1000000
+# Memory per buffered child (int object, list slot, set entry while sorting)
+# used to turn max_bytes into a buffer size; tracemalloc shows about 110 bytes
+STATE_BYTES = 120
+BLOCK_RECORDS = 8192  # records read or written per file access
+MERGE_RUNS = 16  # run files read at once by one merge
+
+
+def _read(path, width):
+    # Yield the packed states of a level or run file in order
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(width * BLOCK_RECORDS)
+            if not block:
+                return
+            for i in range(0, len(block), width):
+                yield int.from_bytes(block[i:i + width], "big")
+
+
+def _write(path, states, width):
+    # Write sorted packed states to path; returns how many were written
+    count = 0
+    with open(path, "wb") as f:
+        block = bytearray()
+        for state in states:
+            block += state.to_bytes(width, "big")
+            count += 1
+            if len(block) >= width * BLOCK_RECORDS:
+                f.write(block)
+                block.clear()
+        f.write(block)
+    return count
+
+
+def _contains(path, width, state):
+    # Binary search of a level file for state
+    key = state.to_bytes(width, "big")
+    with open(path, "rb") as f:
+        low, high = 0, os.fstat(f.fileno()).st_size // width
+        while low < high:
+            middle = (low + high) // 2
+            f.seek(middle * width)
+            record = f.read(width)
+            if record == key:
+                return True
+            if record < key:
+                low = middle + 1
+            else:
+                high = middle
+    return False
+
+
+def _new_states(children, seen):
+    # Sorted, duplicate-free children that are not in the sorted stream seen
+    last = None
+    seen = iter(seen)
+    other = next(seen, None)
+    for state in children:
+        if state == last:
+            continue
+        last = state
+        while other is not None and other < state:
+            other = next(seen, None)
+        if state != other:
+            yield state
+
+
+def _merge_runs(runs, directory, width):
+    # Merge runs MERGE_RUNS at a time into new run files until at most
+    # MERGE_RUNS are left; returns the remaining run paths
+    made = len(runs)
+    while len(runs) > MERGE_RUNS:
+        merged = []
+        for i in range(0, len(runs), MERGE_RUNS):
+            group = runs[i:i + MERGE_RUNS]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            merged.append(os.path.join(directory, f"run_{made}.bin"))
+            made += 1
+            _write(merged[-1], _new_states(heapq.merge(*(_read(run, width) for run in group)), ()), width)
+            for run in group:
+                os.remove(run)
+        runs = merged
+    return runs
+
+
+def _levels(packed, start, directory, max_states):
+    # Write level after level below directory; yields (depth, path, count) for
+    # each level as soon as it is complete, until a level comes out empty
+    width = ((packed.size + 1) * packed.tile_bits + 7) // 8
+    paths = [os.path.join(directory, "level_0.bin")]
+    _write(paths[0], [start], width)
+    depth = 0
+    count = 1
+    while count:
+        yield depth, paths[depth], count
+        runs = []
+        buffer = []
+        for state in _read(paths[depth], width):
+            buffer.extend(packed.neighbours(state))
+            if len(buffer) >= max_states:
+                runs.append(os.path.join(directory, f"run_{len(runs)}.bin"))
+                _write(runs[-1], sorted(set(buffer)), width)
+                buffer = []
+        runs = _merge_runs(runs, directory, width)
+        streams = [_read(run, width) for run in runs] + [sorted(set(buffer))]
+        del buffer
+        seen = heapq.merge(*(_read(path, width) for path in paths[max(0, depth - 1):]))
+        depth += 1
+        paths.append(os.path.join(directory, f"level_{depth}.bin"))
+        count = _write(paths[depth], _new_states(heapq.merge(*streams), seen), width)
+        for run in runs:
+            os.remove(run)
+
+
+def External_BFS(start, progress=None, max_states=None, max_bytes=None, directory=None):
+    """Breadth-first search that keeps its levels in files under directory
+    (a temporary directory in the system default place if None).
+
+    At most max_states children are held in memory at once; the budget can
+    also be given as max_bytes (converted at STATE_BYTES per state). Returns
+    (Parent, expanded, cost, depth) like BFS(); Parent only holds the states
+    on the solution path, and expanded counts the levels before the goal's.
+    """
+    if max_states is None:
+        max_states = max_bytes // STATE_BYTES if max_bytes is not None else DEFAULT_MAX_STATES
+    if max_states < 1:
+        raise ValueError("the memory budget must hold at least one state")
+    packed = board_for(start)
+    width = ((packed.size + 1) * packed.tile_bits + 7) // 8
+    s = packed.pack(start)
+    target = packed.pack(goal_state(packed.cols, packed.rows))
+    expanded = 0
+    with tempfile.TemporaryDirectory(prefix="bfs_", dir=directory) as work:
+        paths = []
+        for depth, path, count in _levels(packed, s, work, max_states):
+            paths.append(path)
+            if _contains(path, width, target):
+                print("Reach Goal")
+                return _path_back(packed, paths, width, target), expanded, depth, depth
+            if progress is not None and (expanded + count) // PROGRESS_INTERVAL > expanded // PROGRESS_INTERVAL:
+                progress(expanded + count, count, depth)
+            expanded += count
+    print("No solution found !!!!!!!!!!!!!!!!")
+
+
+def _path_back(packed, paths, width, target):
+    # Parent map of a path from level 0 to target on the last level in paths
+    Parent = {}
+    state = target
+    for path in reversed(paths[:-1]):
+        parent = next(n for n in packed.neighbours(state) if _contains(path, width, n))
+        Parent[state] = parent
+        state = parent
+    Parent[state] = None
+    return PackedMap(Parent, board=packed)
+
+
+def check(max_states=20000):
+    """Compare the distance of every 3x3 state, level by level from the goal,
+    with state_database; returns the number of mismatches."""
+    import state_database
+
+    table = state_database.load_database()
+    packed = board_for(state_database.goal)
+    width = ((packed.size + 1) * packed.tile_bits + 7) // 8
+    mismatches = total = 0
+    with tempfile.TemporaryDirectory(prefix="bfs_") as work:
+        for depth, path, count in _levels(packed, packed.pack(state_database.goal), work, max_states):
+            for state in _read(path, width):
+                if state_database.distance(packed.unpack(state), table) != depth:
+                    mismatches += 1
+            total += count
+            print(f"depth {depth:>2}: {count:>6} states")
+    print(f"{total} states, {mismatches} distances differ from state_database")
+    return mismatches
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["check"]:
+        sys.exit(1 if check() else 0)
+    import time
+    from A_star import printPath
+
+    start = [8, 7, 6, 0, 4, 1, 2, 5, 3]
+    start_time = time.time()
+    Parent, expanded, cost, depth = External_BFS(start, max_states=20000)
+    printPath(Parent, goal_state(3, 3))
+    print(f"cost of path: {cost}, Nodes expanded: {expanded}, Search depth: {depth}, "
+          f"Execution time: {time.time() - start_time:.4f} seconds")
@@ -0,0 +1,240 @@
+"""
+Hash-distributed A* (HDA*) on several processes.
+
+Every state has one owner process, picked by a hash of its packed encoding.
+Each worker keeps the open list, g-values and parents of the states it
+owns. It expands its best state, keeps the children it owns, and sends the
+rest to their owners in batches over multiprocessing queues. A state that
+arrives with a lower g than its owner has seen is (re)opened, so the
+workers need not expand in global f order.
+
+When the goal's owner pops the goal, its g becomes the incumbent, which is
+shared by all workers; states with f >= incumbent are dropped. The search
+is over when every worker is idle and every batch sent has been received:
+then nothing left anywhere can beat the incumbent, which is optimal. The
+parent process checks this by polling per-worker counters, then recovers
+the path by asking each state's owner for its parent.
+"""
+
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+
+from A_star import manhattan_distance, tile_table
+from board import goal_state
+from packed_state import PackedMap, board_for
+
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+BATCH_SIZE = 256          # states sent to another worker in one message
+EXPANSIONS_PER_POLL = 256  # expansions between checks of the inbox
+POLL_SECONDS = 0.005
+NO_SOLUTION = 2 ** 31 - 1
+
+
+def _owner(state, workers):
+    # Multiplicative (Fibonacci) hash: the low bits of a packed state are the
+    # blank index, so state % workers alone would split the space badly
+    return (((state * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % workers
+
+
+def _worker(index, workers, start, heuristic, inboxes, results, counters, idle, incumbent):
+    # counters[4 * i:4 * i + 4] = batches sent, batches received, expanded,
+    # open list size of worker i; each worker only writes its own slots
+    packed = board_for(start)
+    goal = goal_state(packed.cols, packed.rows)
+    target = packed.pack(goal)
+    table = tile_table(heuristic, goal)
+    moves = packed.moves
+    inbox = inboxes[index]
+    base = 4 * index
+    frontier = []  # (F, H, G, State); G is carried rather than taken as F - H, which a real h rounds
+    g_n = {}
+    Parent = {}
+    outboxes = [[] for _ in range(workers)]
+    expanded = search_depth = 0
+
+    def send(owner):
+        counters[base] += 1
+        inboxes[owner].put(("nodes", outboxes[owner]))
+        outboxes[owner] = []
+
+    def receive(state, g, h, parent):
+        if state not in g_n or g < g_n[state]:
+            g_n[state] = g
+            Parent[state] = parent
+            heapq.heappush(frontier, (g + h, h, g, state))
+
+    while True:
+        # Idle: block until something arrives; busy: only take what is queued
+        while True:
+            try:
+                message = inbox.get(timeout=POLL_SECONDS) if idle[index] else inbox.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "nodes":
+                idle[index] = 0
+                for node in message[1]:
+                    receive(*node)
+                counters[base + 1] += 1
+            elif kind == "parent":
+                results.put(("parent", message[1], Parent.get(message[1])))
+            elif kind == "stop":
+                results.put(("stats", expanded, search_depth))
+                return
+        if idle[index]:
+            continue
+
+        bound = incumbent.value
+        for _ in range(EXPANSIONS_PER_POLL):
+            if not frontier:
+                break
+            f, h, g, v = heapq.heappop(frontier)
+            if g != g_n[v]:
+                continue  # stale: v was reached again with a lower g
+            if f >= bound:
+                frontier.clear()  # nothing left here can beat the incumbent
+                break
+            expanded += 1
+            search_depth = max(search_depth, g)
+            if v == target:
+                with incumbent.get_lock():
+                    if g < incumbent.value:
+                        incumbent.value = g
+                    bound = incumbent.value
+                continue
+            for neighbour, tile, source, dest in moves(v):
+                if neighbour == Parent[v]:
+                    continue
+                if table is not None:
+                    h_neighbour = h + table[tile][dest] - table[tile][source]
+                else:
+                    h_neighbour = heuristic(packed.unpack(neighbour), goal)
+                owner = _owner(neighbour, workers)
+                if owner == index:
+                    receive(neighbour, g + 1, h_neighbour, v)
+                else:
+                    outboxes[owner].append((neighbour, g + 1, h_neighbour, v))
+                    if len(outboxes[owner]) >= BATCH_SIZE:
+                        send(owner)
+        counters[base + 2] = expanded
+        counters[base + 3] = len(frontier)
+
+        if not frontier:
+            for owner in range(workers):
+                if outboxes[owner]:
+                    send(owner)
+            idle[index] = 1
+
+
+def HDA_Star(start, heuristic=manhattan_distance, workers=None, progress=None):
+    """A* on `workers` processes (default: one per CPU), each owning a hash
+    partition of the states. Returns (Parent, expanded, cost, depth) like
+    A_Star; Parent only holds the states on the solution path. The heuristic
+    must be consistent (as for A_Star), may be real-valued, and is handed to
+    the workers by fork or pickling. Raises RuntimeError if a worker dies."""
+    workers = workers or os.cpu_count() or 1
+    packed = board_for(start)
+    goal = goal_state(packed.cols, packed.rows)
+    s = packed.pack(start)
+    if start == goal:
+        print("Reach Goal")
+        return PackedMap({s: None}, board=packed), 0, 0, 0
+
+    inboxes = [multiprocessing.Queue() for _ in range(workers)]
+    results = multiprocessing.Queue()
+    # One extra sent-counter slot (at the end) for the batch holding the start
+    counters = multiprocessing.Array("q", 4 * workers + 1, lock=False)
+    idle = multiprocessing.Array("b", workers, lock=False)
+    incumbent = multiprocessing.Value("i", NO_SOLUTION)
+    processes = [multiprocessing.Process(target=_worker, daemon=True,
+                                         args=(i, workers, start, heuristic, inboxes, results,
+                                               counters, idle, incumbent))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        counters[4 * workers] = 1
+        inboxes[_owner(s, workers)].put(("nodes", [(s, 0, heuristic(start, goal), None)]))
+
+        last_report = 0
+        while True:
+            time.sleep(POLL_SECONDS)
+            _check_workers(processes)
+            before = _message_counts(counters, workers)
+            if before[0] == before[1] and all(idle) and _message_counts(counters, workers) == before:
+                break
+            if progress is not None:
+                expanded = sum(counters[4 * i + 2] for i in range(workers))
+                if expanded // PROGRESS_INTERVAL > last_report // PROGRESS_INTERVAL:
+                    progress(expanded, sum(counters[4 * i + 3] for i in range(workers)), 0)
+                    last_report = expanded
+
+        cost = incumbent.value
+        Parent = None
+        if cost != NO_SOLUTION:
+            Parent = {}
+            state = packed.pack(goal)
+            while state is not None:
+                inboxes[_owner(state, workers)].put(("parent", state))
+                _, state, parent = _result(results, processes)
+                Parent[state] = parent
+                state = parent
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        expanded = search_depth = 0
+        for _ in range(workers):
+            _, count, depth = _result(results, processes)
+            expanded += count
+            search_depth = max(search_depth, depth)
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    if Parent is None:
+        print("No Solution Found !!!!!!!!!!!!! ")
+        return None
+    print("reach goal")
+    return PackedMap(Parent, board=packed), expanded, cost, search_depth
+
+
+def _check_workers(processes):
+    # A worker that died (an exception in the heuristic, say) would leave the
+    # others idle and its batches unanswered, so the search would never end.
+    # Workers only exit cleanly (code 0) once told to stop.
+    for i, process in enumerate(processes):
+        if process.exitcode not in (None, 0):
+            raise RuntimeError(f"HDA* worker {i} exited with code {process.exitcode}")
+
+
+def _result(results, processes):
+    # The next message on results, raising if a worker dies while we wait
+    while True:
+        try:
+            return results.get(timeout=POLL_SECONDS * 20)
+        except queue.Empty:
+            _check_workers(processes)
+
+
+def _message_counts(counters, workers):
+    # (batches sent, batches received) over all workers and the start batch
+    sent = counters[4 * workers] + sum(counters[4 * i] for i in range(workers))
+    received = sum(counters[4 * i + 1] for i in range(workers))
+    return sent, received
+
+
+if __name__ == "__main__":
+    from A_star import printPath
+
+    start = [8, 7, 6, 0, 4, 1, 2, 5, 3]
+    for workers in (1, 2, 4):
+        start_time = time.time()
+        Parent, expanded, cost, depth = HDA_Star(start, workers=workers)
+        print(f"workers={workers}: cost of path: {cost}, Nodes expanded: {expanded}, "
+              f"Search depth: {depth}, Execution time: {time.time() - start_time:.4f} seconds")
+    printPath(Parent, goal_state(3, 3))
@@ -0,0 +1,87 @@
+"""
+Binary min-heap with a position index, for open lists that need decrease-key.
+
+heapq can only add entries, so a search that finds a cheaper path to a
+queued state has to push a second entry and skip the stale one later.
+IndexedHeap keeps one entry per item and moves it up in place instead.
+"""
+
+
+class IndexedHeap:
+    """Min-heap of (priority, item) with at most one entry per (hashable) item."""
+
+    def __init__(self):
+        self._heap = []       # [priority, item]
+        self._position = {}   # item -> index in _heap
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item):
+        return item in self._position
+
+    def priority(self, item):
+        return self._heap[self._position[item]][0]
+
+    def push(self, item, priority):
+        """Add item, or lower its priority if it is already queued."""
+        if item in self._position:
+            self.decrease_key(item, priority)
+            return
+        self._heap.append([priority, item])
+        self._position[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def decrease_key(self, item, priority):
+        """Lower the priority of a queued item; a higher priority is ignored."""
+        index = self._position[item]
+        if priority < self._heap[index][0]:
+            self._heap[index][0] = priority
+            self._sift_up(index)
+
+    def pop(self):
+        """Remove and return (item, priority) with the lowest priority."""
+        heap = self._heap
+        last = heap.pop()
+        if not heap:
+            del self._position[last[1]]
+            return last[1], last[0]
+        top = heap[0]
+        heap[0] = last
+        self._position[last[1]] = 0
+        del self._position[top[1]]
+        self._sift_down(0)
+        return top[1], top[0]
+
+    def _sift_up(self, index):
+        heap, position = self._heap, self._position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if entry[0] < heap[parent][0]:
+                heap[index] = heap[parent]
+                position[heap[index][1]] = index
+                index = parent
+            else:
+                break
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def _sift_down(self, index):
+        heap, position = self._heap, self._position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if heap[child][0] < entry[0]:
+                heap[index] = heap[child]
+                position[heap[index][1]] = index
+                index = child
+            else:
+                break
+        heap[index] = entry
+        position[entry[1]] = index
@@ -0,0 +1,101 @@
+"""
+Random puzzle instances.
+
+random_solvable_state draws a board uniformly from the solvable ones
+without retrying: it shuffles, and if the result is unsolvable swaps the
+first two tiles. That swap pairs every unsolvable board with exactly one
+solvable board, so each solvable board stays equally likely.
+
+states_at_distance draws 3x3 boards whose optimal solution has an exact
+length, from the state_database table.
+
+    python instances.py random -n 1000 --size 4 -o boards.txt
+    python instances.py distance 24 -n 200 --seed 7 -o depth24.txt
+
+Files have one board per line ("1 0 2 7 5 4 8 6 3"), as read by batch.py.
+A line does not record its shape, so the CLI only writes square boards.
+"""
+
+import argparse
+import random
+import sys
+
+from board import goal_state, is_solvable
+
+
+def random_solvable_state(cols=3, rows=None, rng=random):
+    """A uniformly random solvable cols x rows board."""
+    rows = rows or cols
+    state = goal_state(cols, rows)
+    rng.shuffle(state)
+    if not is_solvable(state, cols):
+        # Swapping two tiles (not the blank) flips the permutation parity only
+        i, j = [p for p, tile in enumerate(state) if tile != 0][:2]
+        state[i], state[j] = state[j], state[i]
+    return state
+
+
+def random_states(count, cols=3, rows=None, seed=None):
+    """Yield count uniformly random solvable boards; the same seed gives the same boards."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield random_solvable_state(cols, rows, rng)
+
+
+def states_at_distance(distance, count, seed=None, table=None):
+    """count 3x3 boards exactly distance moves from the goal, drawn uniformly.
+
+    Boards are distinct while count is at most the number of boards at that
+    distance, and drawn with replacement beyond it. Raises ValueError if no
+    board is that far from the goal (the maximum is 31).
+    """
+    import state_database
+
+    if table is None:
+        table = state_database.load_database()
+    ranks = [r for r, d in enumerate(table[:]) if d == distance]
+    if not ranks:
+        raise ValueError(f"No 3x3 board is {distance} moves from the goal")
+    rng = random.Random(seed)
+    if count <= len(ranks):
+        chosen = rng.sample(ranks, count)
+    else:
+        chosen = rng.choices(ranks, k=count)
+    return [state_database.unrank(r) for r in chosen]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write random solvable puzzle instances, one per line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    uniform = commands.add_parser("random", help="uniformly random solvable boards")
+    uniform.add_argument("--size", type=int, default=3, help="board width and height (default 3)")
+    exact = commands.add_parser("distance", help="3x3 boards at an exact optimal distance")
+    exact.add_argument("distance", type=int)
+    for command in (uniform, exact):
+        command.add_argument("-n", "--count", type=int, default=100)
+        command.add_argument("--seed", type=int, default=None)
+        command.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.command == "random":
+        if args.size < 2:
+            parser.error("boards need at least two rows and columns")
+        states = random_states(args.count, args.size, seed=args.seed)
+    else:
+        try:
+            states = states_at_distance(args.distance, args.count, args.seed)
+        except ValueError as e:
+            parser.error(str(e))
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for state in states:
+            out.write(" ".join(map(str, state)) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
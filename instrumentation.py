@@ -0,0 +1,100 @@
+"""
+Search instrumentation.
+
+BFS, DfS, IDFS and A_Star take an optional `instrument` and report to it
+from their inner loops: expand(depth, frontier) once per expansion and
+generate(children, duplicates) once per expanded state. Without one they
+only pay an `is not None` test per expansion. A_Star also times its
+heuristic through instrument.timed().
+
+    with Instrument(memory=True) as instrument:
+        A_Star(start, manhattan_distance, instrument=instrument)
+    instrument.record()   # {'expanded': ..., 'generated': ..., ...}
+
+record() is a plain dict that uses StatsPanel's keys where they overlap
+(expanded, frontier, depth, time), so it can be shown as it is or written
+to JSON by the batch tools.
+"""
+
+import time
+import tracemalloc
+from collections import Counter
+
+
+class Instrument:
+    """Counters filled in by a search; memory=True also tracks the peak
+    allocation with tracemalloc, which slows the search down severalfold."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0    # children that were already open, closed or on the path
+        self.frontier_peak = 0
+        self.depth_counts = Counter()  # depth -> expansions
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.memory_peak = None
+        self.time = 0.0
+        self._began = None
+        self._tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        if self.memory:
+            self._tracing = not tracemalloc.is_tracing()
+            if self._tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        self._began = time.perf_counter()
+
+    def stop(self):
+        self.time += time.perf_counter() - self._began
+        if self.memory:
+            self.memory_peak = tracemalloc.get_traced_memory()[1] - self._baseline
+            if self._tracing:
+                tracemalloc.stop()
+
+    def expand(self, depth, frontier):
+        self.expanded += 1
+        self.depth_counts[depth] += 1
+        if frontier > self.frontier_peak:
+            self.frontier_peak = frontier
+
+    def generate(self, children, duplicates):
+        self.generated += children
+        self.duplicates += duplicates
+
+    def timed(self, heuristic):
+        """heuristic wrapped to count and time its calls; a tile_distance
+        attribute is kept, so incremental updates still apply."""
+        def timed_heuristic(current, goal):
+            began = time.perf_counter()
+            h = heuristic(current, goal)
+            self.heuristic_time += time.perf_counter() - began
+            self.heuristic_calls += 1
+            return h
+        if hasattr(heuristic, "tile_distance"):
+            timed_heuristic.tile_distance = heuristic.tile_distance
+        return timed_heuristic
+
+    def record(self):
+        return {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'frontier': self.frontier_peak,
+            'depth': max(self.depth_counts, default=0),
+            'depth_counts': dict(sorted(self.depth_counts.items())),
+            'heuristic_calls': self.heuristic_calls,
+            'heuristic_time': self.heuristic_time,
+            'memory_peak': self.memory_peak,
+            'time': self.time,
+        }
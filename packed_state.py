@@ -0,0 +1,193 @@
+"""
+Packed-integer encoding of puzzle states.
+
+A board is stored in a single int: the index of the blank is cached in
+the low bits and the tiles follow, position 0 in the most significant
+field. Comparing two packed ints therefore orders them exactly like
+comparing the lists, so heaps keyed by packed states break ties the same
+way they did with list states. Each field is 4 bits wide for boards of up
+to 16 cells (8- and 15-puzzle) and 5 bits for up to 32 (24-puzzle).
+
+Packed states are hashable and use far less memory than the tuple(list)
+keys the solvers used to build, and a move is applied with a shift, a mask
+and an addition instead of list.copy() and a swap.
+
+The solvers work on packed states internally; pack()/unpack() and PackedMap
+keep the list/tuple based API the GUI and scripts expect, and
+PackedMap.moves_to(goal) reads a solution out of a parent map as a move
+string without building any boards. The module-level
+functions are the 3x3 board; board_for(state) gives the encoder for any
+other size.
+"""
+
+from collections.abc import Mapping
+from functools import lru_cache
+
+from board import adjacent, dimensions, move_letter
+
+
+class PackedBoard:
+    """Packed encoding and move tables for one cols x rows board."""
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.tile_bits = max(4, (self.size - 1).bit_length())
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.blank_mask = self.tile_mask
+        self.move_table = self._build_moves()
+
+    def _shift(self, index):
+        return self.tile_bits * (self.size - index)
+
+    def _build_moves(self):
+        # For every blank position, one entry per legal move in the order the
+        # solvers have always used (up, down, left, right):
+        # (shift of the tile that slides, multiplier moving it to the blank's
+        # position, delta of the cached blank index, position of that tile).
+        moves = []
+        for blank, targets in enumerate(adjacent(self.cols, self.rows)):
+            moves.append(tuple((self._shift(target),
+                                (1 << self._shift(blank)) - (1 << self._shift(target)),
+                                target - blank,
+                                target)
+                               for target in targets))
+        return tuple(moves)
+
+    def pack(self, state):
+        """Encode a list/tuple board as a packed int."""
+        packed = 0
+        for i, tile in enumerate(state):
+            packed |= tile << self._shift(i)
+            if tile == 0:
+                packed |= i
+        return packed
+
+    def unpack(self, packed):
+        """Decode a packed int back into a list board."""
+        bits, mask = self.tile_bits, self.tile_mask
+        return [(packed >> (bits * (self.size - i))) & mask for i in range(self.size)]
+
+    def blank_index(self, packed):
+        return packed & self.blank_mask
+
+    def tile_at(self, packed, index):
+        return (packed >> self._shift(index)) & self.tile_mask
+
+    def neighbours(self, packed):
+        """Return the packed states reachable by one move of the blank."""
+        mask = self.tile_mask
+        result = []
+        for shift, mul, blank_delta, _ in self.move_table[packed & mask]:
+            result.append(packed + ((packed >> shift) & mask) * mul + blank_delta)
+        return result
+
+    def slide(self, packed, index):
+        """Slide the tile at index into the blank."""
+        blank = packed & self.blank_mask
+        tile = (packed >> self._shift(index)) & self.tile_mask
+        return packed + tile * ((1 << self._shift(blank)) - (1 << self._shift(index))) + index - blank
+
+    def moves(self, packed):
+        """Like neighbours(), but return (child, tile, from_index, to_index) tuples
+        describing the tile that slid into the blank."""
+        mask = self.tile_mask
+        blank = packed & mask
+        result = []
+        for shift, mul, blank_delta, source in self.move_table[blank]:
+            tile = (packed >> shift) & mask
+            result.append((packed + tile * mul + blank_delta, tile, source, blank))
+        return result
+
+
+@lru_cache(maxsize=None)
+def packed_board(cols, rows=None):
+    return PackedBoard(cols, rows or cols)
+
+
+def board_for(state):
+    """The PackedBoard matching the size of a list/tuple board."""
+    return packed_board(*dimensions(state))
+
+
+_board = packed_board(3, 3)
+cols = _board.cols
+rows = _board.rows
+SIZE = _board.size
+TILE_BITS = _board.tile_bits
+TILE_MASK = _board.tile_mask
+BLANK_MASK = _board.blank_mask
+MOVES = _board.move_table
+pack = _board.pack
+unpack = _board.unpack
+blank_index = _board.blank_index
+tile_at = _board.tile_at
+neighbours = _board.neighbours
+slide = _board.slide
+moves = _board.moves
+
+
+class PackedMap(Mapping):
+    """Read-only view of a dict keyed by packed states.
+
+    Keys are looked up as lists/tuples and values are decoded with `decode`
+    (list or tuple), so code written against the old {tuple: list} parent
+    maps keeps working without the solvers building those maps.
+    """
+
+    def __init__(self, data, decode=list, board=_board):
+        self._data = data
+        self._decode = decode
+        self._board = board
+
+    def __getitem__(self, key):
+        value = self._data[self._board.pack(key)]
+        if value is None:
+            return None
+        return self._decode(self._board.unpack(value))
+
+    def __contains__(self, key):
+        return self._board.pack(key) in self._data
+
+    def __iter__(self):
+        for packed in self._data:
+            yield tuple(self._board.unpack(packed))
+
+    def __len__(self):
+        return len(self._data)
+
+    def _parent_blank(self, packed):
+        # Blank index of packed's parent; None at the root or for unknown states
+        parent = self._data.get(packed)
+        return None if parent is None else parent & self._board.blank_mask
+
+    def moves_to(self, state):
+        """Move string from the root of the map to state (see board.MOVE_LETTERS)."""
+        board = self._board
+        packed = board.pack(state)
+        letters = []
+        source = self._parent_blank(packed)
+        while source is not None:
+            letters.append(move_letter(source, packed & board.blank_mask, board.cols))
+            packed = board.slide(packed, source)
+            source = self._parent_blank(packed)
+        return "".join(reversed(letters))
+
+
+class MoveMap(PackedMap):
+    """PackedMap over {state: blank index of its parent (None for the root)}.
+
+    The parent is the state with the tile at that index slid back into the
+    blank, so a search only has to keep one small int per visited state.
+    """
+
+    def __getitem__(self, key):
+        packed = self._board.pack(key)
+        source = self._data[packed]
+        if source is None:
+            return None
+        return self._decode(self._board.unpack(self._board.slide(packed, source)))
+
+    def _parent_blank(self, packed):
+        return self._data.get(packed)
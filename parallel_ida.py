@@ -0,0 +1,193 @@
+"""
+Root-split parallel IDA* and IDFS on a process pool.
+
+The tree is first expanded breadth-first to a fixed depth (never undoing the
+previous move), which gives a list of subtree roots. Each iteration hands
+every root whose f fits the threshold to the pool; the workers run
+IDA_star.bounded_search below it and send back a path, or the smallest f
+they cut off. A path found under threshold t has cost t (every
+shorter one would have been found in an earlier iteration), so the first
+one is optimal: a shared flag is then raised and the workers abandon the
+subtrees they are still on.
+
+With heuristic=None the bound is the depth alone, which makes the search an
+iterative deepening DFS (IDFS) rather than IDA*.
+"""
+
+import multiprocessing
+import os
+import time
+
+from A_star import manhattan_distance, tile_table
+from board import dimensions, goal_state
+from IDA_star import EPSILON, FOUND, INVERSE, NONE, _moves_for, _replay, bounded_search
+
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+ROOTS_PER_WORKER = 16  # split until there are this many subtrees per worker
+
+
+def no_heuristic(current, goal):
+    """h = 0: IDA* with it is plain iterative deepening on depth."""
+    return 0
+
+
+no_heuristic.tile_distance = lambda dx, dy: 0
+
+# Set in each worker by _init_worker
+_found = None  # shared flag, raised once any worker has a solution
+_heuristic = None
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _init_worker(found, heuristic):
+    global _found, _heuristic
+    _found = found
+    _heuristic = heuristic
+
+
+def _search_subtree(task):
+    # IDA_star's depth-first search below one root; returns (moves after the
+    # root or None, smallest f cut off, expanded, seconds spent)
+    begin = time.perf_counter()
+    state, blank, prev, g, h, threshold = task
+    cols, rows = dimensions(state)
+    goal = goal_state(cols, rows)
+    state = list(state)
+    all_moves = _moves_for(cols, rows, tile_table(_heuristic, goal))
+    moves = []
+
+    def tick(expanded):
+        if _found.value:
+            raise _Cancelled
+
+    if _found.value:
+        return None, float("inf"), 0, 0.0
+    search, expanded = bounded_search(state, goal, _heuristic, all_moves, moves, tick)
+    try:
+        t = search(g, h, blank, prev, threshold)
+    except _Cancelled:
+        return None, float("inf"), expanded(), time.perf_counter() - begin
+    if t == FOUND:
+        _found.value = 1
+        return moves, threshold, expanded(), time.perf_counter() - begin
+    return None, t, expanded(), time.perf_counter() - begin
+
+
+def _split(start, heuristic, goal, count):
+    # Expand breadth-first until there are at least count roots; returns
+    # (roots, expanded, path) with path set if the goal came up on the way.
+    # A root is (state, blank, prev, g, h, moves from start).
+    cols, rows = dimensions(start)
+    table = tile_table(heuristic, goal)
+    all_moves = _moves_for(cols, rows, table)
+    roots = [(tuple(start), start.index(0), NONE, 0, heuristic(start, goal), ())]
+    expanded = 0
+    while len(roots) < count:
+        children = []
+        for state, blank, prev, g, h, moves in roots:
+            if list(state) == goal:
+                return roots, expanded, _replay(start, moves)
+            expanded += 1
+            skip = INVERSE[prev]
+            for target, direction, delta in all_moves[blank]:
+                if direction == skip:
+                    continue
+                child = list(state)
+                child[blank], child[target] = child[target], 0
+                child_h = h + delta[child[blank]] if table is not None else heuristic(child, goal)
+                children.append((tuple(child), target, direction, g + 1, child_h, moves + (target,)))
+        roots = children
+    for state, _, _, _, _, moves in roots:
+        if list(state) == goal:
+            return roots, expanded, _replay(start, moves)
+    return roots, expanded, None
+
+
+def Parallel_IDA_Star(start, workers=None, heuristic=manhattan_distance, progress=None,
+                      max_depth=None, stats=None):
+    """IDA* (or IDFS with heuristic=None) with the subtrees below a fixed split
+    depth searched on `workers` processes (default: one per CPU).
+
+    Returns (path, depth, expanded) like IDA_Star. If stats is a dict,
+    'workers', 'roots' and 'utilization' are stored in it; utilization is
+    the time the workers spent searching over the wall time of the search,
+    i.e. how many cores were kept busy on average. It is not a speedup over
+    the serial IDA_Star, which expands a different number of nodes.
+    """
+    begin = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    heuristic = heuristic or no_heuristic
+    cols, rows = dimensions(start)
+    goal = goal_state(cols, rows)
+    if max_depth is None:
+        max_depth = 8 * cols * rows
+    if stats is None:
+        stats = {}
+    stats['workers'] = workers
+
+    roots, expanded, path = _split(list(start), heuristic, goal, ROOTS_PER_WORKER * workers)
+    stats['roots'] = len(roots)
+    stats['utilization'] = 1.0
+    threshold = heuristic(list(start), goal)
+    if path is not None:
+        return path, len(path) - 1, expanded
+
+    found = multiprocessing.Value("b", 0, lock=False)
+    busy = 0.0
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(found, heuristic)) as pool:
+        while threshold <= max_depth:
+            minimum = float("inf")
+            tasks = []
+            for state, blank, prev, g, h, moves in roots:
+                if g + h > threshold + EPSILON:
+                    minimum = min(minimum, g + h)
+                else:
+                    tasks.append(((state, blank, prev, g, h, threshold), moves))
+            solution = None
+            done = 0
+            for index, (moves, t, count, seconds) in pool.imap_unordered(
+                    _run_task, enumerate(task for task, _ in tasks)):
+                done += 1
+                expanded += count
+                busy += seconds
+                if moves is not None and solution is None:
+                    solution = tasks[index][1] + tuple(moves)
+                elif t < minimum:
+                    minimum = t
+                if progress is not None:
+                    progress(expanded, len(tasks) - done, threshold)
+            if solution is not None:
+                stats['utilization'] = busy / (time.perf_counter() - begin)
+                return _replay(start, solution), threshold, expanded
+            if minimum == float("inf"):
+                break
+            threshold = minimum
+    stats['utilization'] = busy / (time.perf_counter() - begin)
+    return None, threshold, expanded
+
+
+def _run_task(item):
+    index, task = item
+    return index, _search_subtree(task)
+
+
+def Parallel_IDFS(start, workers=None, progress=None, max_depth=50, stats=None):
+    """Iterative deepening DFS on a process pool; returns (path, depth, expanded)."""
+    return Parallel_IDA_Star(start, workers, None, progress, max_depth, stats)
+
+
+if __name__ == "__main__":
+    from IDFS import print_path
+
+    start = [8, 7, 6, 0, 4, 1, 2, 5, 3]
+    for workers in (1, 2, 4):
+        stats = {}
+        start_time = time.time()
+        path, depth, expanded = Parallel_IDA_Star(start, workers=workers, stats=stats)
+        print(f"workers={workers}: cost of path: {len(path) - 1}, Nodes expanded: {expanded}, "
+              f"Roots: {stats['roots']}, Cores busy: {stats['utilization']:.2f}, "
+              f"Execution time: {time.time() - start_time:.4f} seconds")
+    print_path(path)
@@ -0,0 +1,164 @@
+"""
+Additive disjoint pattern databases (PDBs) for the 8- and 15-puzzle.
+
+The tiles are split into disjoint groups. For each group a backward search
+from the goal records, for every placement of that group's tiles, the
+fewest moves *of those tiles* needed to bring them home (moves of other
+tiles are free). Since no move is counted by two groups, the lookups of
+all groups can be added and the sum is still admissible -- and it is much
+tighter than Manhattan distance because it sees tiles blocking each other.
+
+The blank is left out of the abstraction (Korf and Felner): a group tile
+may slide into any neighbouring cell not held by another group tile. One
+real move then changes at most one group's entry, by at most one, so the
+sum is also consistent and A* may close states when it pops them. Keeping
+the blank and taking the minimum over its positions gives larger values
+but breaks consistency.
+
+Each group's table is one byte per placement (cells**len(group) entries),
+written to pdb_<cols>x<rows>_<tiles>.v<FORMAT>.bin next to this module the
+first time it is needed and read back from there afterwards.
+
+    python pattern_database.py build      # builds every table used below
+"""
+
+import os
+from collections import deque
+
+from board import adjacent, goal_state
+
+UNSEEN = 0xFF
+FORMAT = 2  # in the file name, so tables built by another construction are not read
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_pattern(tiles, cols=3, rows=3):
+    """Backward BFS from goal; returns the table for one tile group.
+
+    The abstract state is the positions of the group's tiles, encoded as
+    index = sum(position_k * size**k), so the search runs over a flat byte
+    array rather than a dict of tuples. Every move slides one group tile
+    into a free neighbouring cell and costs 1.
+    """
+    size = cols * rows
+    goal = goal_state(cols, rows)
+    neighbours = adjacent(cols, rows)
+    weights = [size ** k for k in range(len(tiles))]
+    table = bytearray([UNSEEN]) * (size ** len(tiles))
+
+    start = sum(goal.index(tile) * w for tile, w in zip(tiles, weights))
+    table[start] = 0
+    frontier = deque([start])
+    while frontier:
+        index = frontier.popleft()
+        d = table[index] + 1
+        positions = []
+        rest = index
+        for _ in weights:
+            rest, pos = divmod(rest, size)
+            positions.append(pos)
+        for pos, weight in zip(positions, weights):
+            for target in neighbours[pos]:
+                if target in positions:
+                    continue
+                child = index + (target - pos) * weight
+                if table[child] == UNSEEN:
+                    table[child] = d
+                    frontier.append(child)
+    return table
+
+
+class PatternDatabase:
+    """Distance table for one tile group, loaded (or built) on first use."""
+
+    def __init__(self, tiles, cols=3, rows=None, data_dir=DATA_DIR):
+        self.tiles = tuple(tiles)
+        self.cols = cols
+        self.rows = rows or cols
+        self.size = self.cols * self.rows
+        self.path = os.path.join(data_dir, "pdb_{}x{}_{}.v{}.bin".format(
+            self.cols, self.rows, "-".join(map(str, self.tiles)), FORMAT))
+        self.weights = tuple((tile, self.size ** k) for k, tile in enumerate(self.tiles))
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = self.load()
+        return self._table
+
+    def build(self):
+        table = build_pattern(self.tiles, self.cols, self.rows)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(table)
+        os.replace(tmp_path, self.path)
+        return bytes(table)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self.build()
+        with open(self.path, "rb") as f:
+            table = f.read()
+        if len(table) != self.size ** len(self.tiles):
+            raise ValueError(f"{self.path} is not a pattern database for tiles {self.tiles}")
+        return table
+
+
+class PatternDatabaseHeuristic:
+    """Additive PDB heuristic, callable like manhattan_distance(current, goal).
+
+    The tables are built for one board size and its standard goal
+    (board.goal_state), so `goal` must be that board; a board of another
+    size raises ValueError.
+    """
+
+    def __init__(self, groups, name, cols=3, rows=None):
+        self.name = name
+        self.size = cols * (rows or cols)
+        self.databases = [PatternDatabase(tiles, cols, rows) for tiles in groups]
+
+    def __call__(self, current, goal):
+        if len(current) != self.size:
+            raise ValueError(f"The {self.name} pattern database is for boards of {self.size} tiles, "
+                             f"not {len(current)}")
+        position = [0] * self.size
+        for i, tile in enumerate(current):
+            position[tile] = i
+        h = 0
+        for db in self.databases:
+            index = 0
+            for tile, weight in db.weights:
+                index += position[tile] * weight
+            h += db.table[index]
+        return h
+
+    def load(self):
+        """Load (or build) every table now instead of on the first call."""
+        for db in self.databases:
+            db.table
+        return self
+
+    def __repr__(self):
+        return f"PatternDatabaseHeuristic({self.name})"
+
+
+PDB_4_4 = PatternDatabaseHeuristic([(1, 2, 3, 4), (5, 6, 7, 8)], "4-4")
+PDB_3_5 = PatternDatabaseHeuristic([(1, 2, 3), (4, 5, 6, 7, 8)], "3-5")
+
+# 15-puzzle: 4-4-4-3 builds in under a second; 5-5-5 is tighter but each
+# of its tables takes 16 times the memory and build time.
+PDB_15_4_4_4_3 = PatternDatabaseHeuristic(
+    [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11, 12), (13, 14, 15)], "4-4-4-3", cols=4)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "build":
+        for heuristic in (PDB_4_4, PDB_3_5, PDB_15_4_4_4_3):
+            for db in heuristic.databases:
+                db.build()
+                print(f"Wrote {db.path}")
+    else:
+        print("usage: python pattern_database.py build")
@@ -0,0 +1,58 @@
+"""
+Background execution of the solvers for the GUI.
+
+A SearchWorker runs one search on a QThread so the window stays responsive.
+The solvers accept a `progress(expanded, frontier, depth)` callback which
+they call every PROGRESS_INTERVAL expansions; the worker forwards those
+numbers to the GUI at most every `interval` seconds and uses the same
+callback to stop the search when Cancel is pressed.
+"""
+
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class SearchCancelled(Exception):
+    """Raised from the progress callback to abort a running search."""
+
+
+class SearchWorker(QThread):
+    """Run job(progress) on a background thread and report back with signals."""
+
+    progress = pyqtSignal(int, int, int)    # expanded, frontier size, depth
+    succeeded = pyqtSignal(object, float)   # job result, running time
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, job, interval=0.1, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.interval = interval
+        self._cancel_requested = False
+        self._last_report = 0.0
+
+    def cancel(self):
+        """Ask the search to stop at its next progress callback."""
+        self._cancel_requested = True
+
+    def report(self, expanded, frontier, depth):
+        """Progress callback handed to the solver (runs on the worker thread)."""
+        if self._cancel_requested:
+            raise SearchCancelled()
+        now = time.time()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.progress.emit(expanded, frontier, depth)
+
+    def run(self):
+        start_time = time.time()
+        try:
+            result = self.job(self.report)
+        except SearchCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.succeeded.emit(result, time.time() - start_time)
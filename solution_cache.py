@@ -0,0 +1,206 @@
+"""
+Cache of solver results keyed by (algorithm, heuristic, state).
+
+Results are kept in memory with least-recently-used eviction and, when a
+path is given, also in a sqlite file so they survive restarts. Any suffix of
+an optimal path is itself an optimal path, so for the optimal solvers every
+state along a cached solution is answered from that solution too, without a
+new search. Their results are also stored once per transpose-symmetry class
+(see symmetry.py): a board and its mirror image share one entry. The sqlite
+store keeps each solution as its start state and a move string
+(board.MOVE_LETTERS) and replays the moves when it is read back.
+
+    cache = SolutionCache(path="solutions.sqlite")
+    path, stats = solve(start, "astar", "manhattan", cache=cache)
+"""
+
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+from board import apply_moves, path_moves
+from symmetry import canonical, transpose_path
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solutions.sqlite")
+
+# Solvers whose paths are shortest paths, so their suffixes are too. The
+# heuristic ones are only trusted with the heuristics below, all checked to be
+# consistent over the 3x3 state space (the pattern databases since they left
+# the blank out); any other heuristic name, such as the repr of an ad-hoc
+# function, is cached for its own board only.
+OPTIMAL_ALGORITHMS = {"bfs", "bibfs", "idfs", "idastar", "astar", "smastar", "database"}
+HEURISTIC_ALGORITHMS = {"astar", "idastar", "smastar"}
+CONSISTENT_HEURISTICS = {"manhattan", "euclidean", "pdb44", "pdb35", "pdb15"}
+
+# The store is only a cache, so a file with another layout is simply emptied.
+# Version 4 also drops paths found with the old, inconsistent pattern databases.
+SCHEMA_VERSION = 4
+_SCHEMA = """
+DROP TABLE IF EXISTS solutions;
+DROP TABLE IF EXISTS suffixes;
+CREATE TABLE solutions (
+    algorithm TEXT, heuristic TEXT, state TEXT, moves TEXT, stats TEXT,
+    PRIMARY KEY (algorithm, heuristic, state));
+CREATE TABLE suffixes (
+    algorithm TEXT, heuristic TEXT, state TEXT, solution TEXT, offset INTEGER, mirrored INTEGER,
+    PRIMARY KEY (algorithm, heuristic, state));
+PRAGMA user_version = 4;
+"""
+
+
+def _state_text(state):
+    return " ".join(map(str, state))
+
+
+def is_optimal(algorithm, heuristic):
+    """Whether algorithm run with heuristic always returns a shortest path."""
+    if algorithm in HEURISTIC_ALGORITHMS:
+        return heuristic in CONSISTENT_HEURISTICS
+    return algorithm in OPTIMAL_ALGORITHMS
+
+
+class SolutionCache:
+    """LRU cache of (path, stats) results, optionally backed by sqlite.
+
+    maxsize bounds the number of solutions held in memory; the states on
+    their paths are indexed as well, so at most maxsize * (path length + 1)
+    states are answered from memory. The sqlite store is not bounded.
+    """
+
+    def __init__(self, maxsize=256, path=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (path, stats)
+        # key -> (key of the solution it lies on, offset, whether the state
+        # there is the mirror image of the one in the key)
+        self._suffixes = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(algorithm, heuristic, state):
+        """Return (key, mirrored): the cache key for state and whether it names
+        state's mirror image. Shortest paths are shared by the whole symmetry
+        class; other solvers' results are only reused for the same board."""
+        if algorithm not in HEURISTIC_ALGORITHMS:
+            heuristic = ""
+        mirrored = False
+        if is_optimal(algorithm, heuristic):
+            state, mirrored = canonical(state)
+        return (algorithm, heuristic or "", tuple(state)), mirrored
+
+    def get(self, algorithm, heuristic, state):
+        """Return (path, stats) for state, or None if nothing cached covers it."""
+        key, mirrored = self.key(algorithm, heuristic, state)
+        result = self._lookup(key)
+        if result is None and self._db is not None:
+            result = self._load(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        path, stats, flipped = result
+        if mirrored != flipped:
+            path = transpose_path(path)
+        return path, stats
+
+    def put(self, algorithm, heuristic, path, stats):
+        """Remember a solution; path[0] is the start state it answers."""
+        key, mirrored = self.key(algorithm, heuristic, path[0])
+        if mirrored:
+            path = transpose_path(path)
+        path = tuple(tuple(state) for state in path)
+        self._remember(key, path, stats)
+        if self._db is not None:
+            self._store(key, path, stats)
+
+    def clear(self):
+        self._entries.clear()
+        self._suffixes.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key):
+        # Returns (path, stats, flipped), flipped if path starts at the mirror of key's state
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            path, stats = self._entries[key]
+            return [list(state) for state in path], dict(stats, cached=True), False
+        if key in self._suffixes:
+            solution, offset, flipped = self._suffixes[key]
+            self._entries.move_to_end(solution)
+            suffix = [list(state) for state in self._entries[solution][0][offset:]]
+            cost = len(suffix) - 1
+            return suffix, {'cost': cost, 'expanded': 0, 'depth': cost, 'time': 0.0, 'cached': True}, flipped
+        return None
+
+    @staticmethod
+    def _path_states(key, path):
+        # (suffix key, offset, mirrored) for every state after the start of path
+        algorithm, heuristic, _ = key
+        for offset, state in enumerate(path[1:], 1):
+            state, mirrored = canonical(state)
+            yield (algorithm, heuristic, tuple(state)), offset, mirrored
+
+    def _remember(self, key, path, stats):
+        if key in self._entries:
+            # The old path's states may not be on the new one
+            self._evict(key, self._entries[key])
+            self._entries.move_to_end(key)
+        self._entries[key] = (path, stats)
+        if is_optimal(*key[:2]):
+            # The newest solution takes over shared states, since it is evicted last
+            for suffix_key, offset, mirrored in self._path_states(key, path):
+                self._suffixes[suffix_key] = (key, offset, mirrored)
+        while len(self._entries) > self.maxsize:
+            self._evict(*self._entries.popitem(last=False))
+
+    def _evict(self, key, entry):
+        if not is_optimal(*key[:2]):
+            return
+        for suffix_key, _, _ in self._path_states(key, entry[0]):
+            if self._suffixes.get(suffix_key, (None,))[0] == key:
+                del self._suffixes[suffix_key]
+
+    def _store(self, key, path, stats):
+        algorithm, heuristic, state = key
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)",
+                             (algorithm, heuristic, _state_text(state), path_moves(path),
+                              json.dumps(stats)))
+            if is_optimal(algorithm, heuristic):
+                self._db.execute("DELETE FROM suffixes WHERE algorithm = ? AND heuristic = ? AND solution = ?",
+                                 (algorithm, heuristic, _state_text(state)))
+                self._db.executemany("INSERT OR IGNORE INTO suffixes VALUES (?, ?, ?, ?, ?, ?)",
+                                     [(algorithm, heuristic, _state_text(s), _state_text(state), offset,
+                                       int(mirrored))
+                                      for (_, _, s), offset, mirrored in self._path_states(key, path)])
+
+    def _load(self, key):
+        algorithm, heuristic, state = key
+        row = self._db.execute("SELECT state, moves, stats FROM solutions WHERE algorithm = ? "
+                               "AND heuristic = ? AND state = ?",
+                               (algorithm, heuristic, _state_text(state))).fetchone()
+        if row is None:
+            row = self._db.execute(
+                "SELECT s.state, s.moves, s.stats FROM suffixes x JOIN solutions s "
+                "ON s.algorithm = x.algorithm AND s.heuristic = x.heuristic AND s.state = x.solution "
+                "WHERE x.algorithm = ? AND x.heuristic = ? AND x.state = ?",
+                (algorithm, heuristic, _state_text(state))).fetchone()
+            if row is None:
+                return None
+        start = [int(tile) for tile in row[0].split()]
+        path = tuple(tuple(s) for s in apply_moves(start, row[1]))
+        self._remember((algorithm, heuristic, path[0]), path, json.loads(row[2]))
+        return self._lookup(key)
@@ -0,0 +1,182 @@
+"""
+Command-line entry point for the sliding-puzzle solvers.
+
+The solver modules (BFS, DFS, IDFS, A_star) only define functions, so they
+can be imported by the GUI or other scripts without running any search.
+This script is the place to solve a single board from the terminal:
+
+    python solve.py 1 0 2 7 5 4 8 6 3
+    python solve.py --algorithm astar --heuristic euclidean 8 6 7 2 5 4 3 0 1
+    python solve.py -a idastar --heuristic pdb15 4 1 2 3 5 0 6 7 8 9 10 11 12 13 14 15
+    python solve.py --cache solutions.sqlite -a astar 1 0 2 7 5 4 8 6 3
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import A_star
+import BFS
+import DFS
+import IDA_star
+import IDFS
+import SMA_star
+import pattern_database
+import state_database
+from instrumentation import Instrument
+from solution_cache import SolutionCache
+from board import apply_moves, dimensions, goal_state, path_moves
+
+
+ALGORITHMS = ["bfs", "bibfs", "dfs", "idfs", "idastar", "astar", "smastar", "database"]
+HEURISTICS = {
+    "manhattan": A_star.manhattan_distance,
+    "euclidean": A_star.euclidean_distance,
+    "pdb44": pattern_database.PDB_4_4,
+    "pdb35": pattern_database.PDB_3_5,
+    "pdb15": pattern_database.PDB_15_4_4_4_3,
+}
+
+
+def solve(start, algorithm="bfs", heuristic="manhattan", cache=None, max_nodes=None, instrument=None):
+    """Run one solver on start and return (path, stats).
+
+    path is the list of states from start to goal, or None if no solution
+    was found (board.path_moves turns it into a move string). stats is the
+    dict shape the GUI shows in StatsPanel.
+    With a SolutionCache, cached answers are returned without searching and
+    new solutions are added to it. max_nodes is the memory budget of smastar.
+    With an Instrument (see instrumentation.py) its record is added to stats
+    as 'instrumentation'; bfs, dfs, idfs and astar fill in the search
+    counters, the other algorithms only the time and memory.
+    """
+    if cache is not None:
+        cached = cache.get(algorithm, heuristic, start)
+        if cached is not None:
+            return cached
+        path, stats = solve(start, algorithm, heuristic, max_nodes=max_nodes, instrument=instrument)
+        if path is not None:
+            cache.put(algorithm, heuristic, path, stats)
+        return path, stats
+
+    if instrument is not None:
+        with instrument:
+            path, stats = _solve(start, algorithm, heuristic, max_nodes, instrument)
+        stats['instrumentation'] = instrument.record()
+        return path, stats
+    return _solve(start, algorithm, heuristic, max_nodes)
+
+
+def _solve(start, algorithm, heuristic, max_nodes, instrument=None):
+    start_time = time.time()
+    goal = goal_state(*dimensions(start))
+    extra = {}
+
+    if algorithm == "bfs":
+        parent, expanded, cost, depth = BFS.BFS(start, instrument=instrument)
+        path = apply_moves(start, parent.moves_to(goal))
+    elif algorithm == "bibfs":
+        parent, expanded, cost, depth = BFS.Bidirectional_BFS(start)
+        path = apply_moves(start, parent.moves_to(goal))
+    elif algorithm == "astar":
+        parent, expanded, cost, depth = A_star.A_Star(start, HEURISTICS[heuristic], instrument=instrument)
+        path = apply_moves(start, parent.moves_to(goal))
+    elif algorithm == "smastar":
+        result = SMA_star.SMA_Star(start, HEURISTICS[heuristic], max_nodes=max_nodes)
+        if result is None:
+            return None, {'cost': None, 'expanded': None, 'depth': None, 'time': time.time() - start_time}
+        parent, expanded, cost, depth, peak, regenerated = result
+        path = apply_moves(start, parent.moves_to(goal))
+        extra = {'peak': peak, 'regenerated': regenerated}
+    elif algorithm == "dfs":
+        goal, parent, expanded, depth = DFS.DfS(start, instrument=instrument)
+        path = apply_moves(start, parent.moves_to(goal)) if goal is not None else None
+        cost = len(path) - 1 if path else None
+    elif algorithm == "idfs":
+        idfs_stats = {}
+        path_tuples, depth = IDFS.IDFS(start, instrument=instrument, stats=idfs_stats)
+        path = [list(state) for state in path_tuples] if path_tuples else None
+        expanded = idfs_stats['expanded']
+        cost = len(path) - 1 if path else None
+    elif algorithm == "idastar":
+        path_tuples, depth, expanded = IDA_star.IDA_Star(start, heuristic=HEURISTICS[heuristic])
+        path = [list(state) for state in path_tuples] if path_tuples else None
+        cost = len(path) - 1 if path else None
+    elif algorithm == "database":
+        if len(start) != state_database.SIZE:
+            raise ValueError("The state database only covers the 3x3 board")
+        path, expanded, cost, depth = state_database.Lookup(start)
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    stats = {'cost': cost, 'expanded': expanded, 'depth': depth, 'time': time.time() - start_time, **extra}
+    return path, stats
+
+
+def parse_state(values):
+    """Parse a square board given as numbers (separate or comma separated)."""
+    tokens = []
+    for value in values:
+        tokens.extend(t for t in value.replace(",", " ").split() if t)
+    state = [int(t) for t in tokens]
+    cols, rows = dimensions(state)
+    if sorted(state) != goal_state(cols, rows):
+        raise ValueError(f"State must contain all values from 0 to {len(state) - 1}")
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve an 8-, 15- or 24-puzzle board.")
+    parser.add_argument("state", nargs="+", help="start state, e.g. 1 0 2 7 5 4 8 6 3")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="bfs")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS), default="manhattan",
+                        help="heuristic used by astar, idastar and smastar")
+    parser.add_argument("--max-nodes", type=int, default=None,
+                        help=f"memory budget of smastar in nodes (default {SMA_star.DEFAULT_MAX_NODES})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="print only the statistics")
+    parser.add_argument("--cache", metavar="FILE", help="sqlite file to reuse and store solutions in")
+    parser.add_argument("--instrument", action="store_true",
+                        help="print search counters and peak memory as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        start = parse_state(args.state)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not BFS.is_solvable(start):
+        print("This puzzle is unsolvable!")
+        return 1
+
+    cache = SolutionCache(path=args.cache) if args.cache else None
+    try:
+        instrument = Instrument(memory=True) if args.instrument else None
+        path, stats = solve(start, args.algorithm, args.heuristic, cache, args.max_nodes, instrument)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if cache is not None:
+            cache.close()
+    if path is None:
+        print("No solution found!")
+        return 1
+
+    if not args.quiet:
+        print("\nPath to goal ({} moves): {}".format(len(path) - 1, path_moves(path)))
+        for state in path:
+            BFS.printPuzzle(state)
+            print("-----")
+    print(f"Cost of path: {stats['cost']}, Nodes expanded: {stats['expanded']}, Search depth: {stats['depth']}")
+    if 'peak' in stats:
+        print(f"Peak nodes in memory: {stats['peak']}, Regenerated: {stats['regenerated']}")
+    print(f"Execution time: {stats['time']:.4f} seconds")
+    if stats.get('cached'):
+        print("(answered from the solution cache)")
+    if 'instrumentation' in stats:
+        print(json.dumps(stats['instrumentation']))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
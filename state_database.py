@@ -0,0 +1,139 @@
+"""
+Precomputed distance-to-goal table for every 8-puzzle state.
+
+The 8-puzzle has 9! = 362880 arrangements, half of them solvable. One
+retrograde BFS from the goal gives the exact number of moves every solvable
+state needs; that is stored one byte per arrangement, indexed by the
+permutation rank (Lehmer code) of the board, with UNREACHABLE for the
+unsolvable half. Once the table exists an optimal path is found by walking
+from the start to any neighbour one move closer to the goal, without
+searching.
+
+    python state_database.py build        # writes state_database.bin
+"""
+
+import mmap
+import os
+import sys
+from collections import deque
+
+from packed_state import neighbours, pack, unpack
+
+goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+SIZE = len(goal)
+UNREACHABLE = 0xFF
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "state_database.bin")
+
+FACTORIALS = [1] * (SIZE + 1)
+for _i in range(1, SIZE + 1):
+    FACTORIALS[_i] = FACTORIALS[_i - 1] * _i
+STATE_COUNT = FACTORIALS[SIZE]
+
+# Number of set bits below each value's bit, for every subset of used values.
+_SMALLER_USED = [[bin(used & ((1 << value) - 1)).count("1") for value in range(SIZE)]
+                 for used in range(1 << SIZE)]
+
+_table = None
+
+
+def rank(state):
+    """Lehmer-code rank of a board, in range(9!)."""
+    r = 0
+    used = 0
+    for i, tile in enumerate(state):
+        r += (tile - _SMALLER_USED[used][tile]) * FACTORIALS[SIZE - 1 - i]
+        used |= 1 << tile
+    return r
+
+
+def unrank(r):
+    """Inverse of rank()."""
+    remaining = list(range(SIZE))
+    state = []
+    for i in range(SIZE):
+        digit, r = divmod(r, FACTORIALS[SIZE - 1 - i])
+        state.append(remaining.pop(digit))
+    return state
+
+
+def build_database(path=DEFAULT_PATH):
+    """Run the retrograde BFS from goal and write the table to path."""
+    table = bytearray([UNREACHABLE]) * STATE_COUNT
+    start = pack(goal)
+    table[rank(goal)] = 0
+    frontier = deque([(start, 0)])
+    while frontier:
+        v, distance = frontier.popleft()
+        for neighbour in neighbours(v):
+            r = rank(unpack(neighbour))
+            if table[r] == UNREACHABLE:
+                table[r] = distance + 1
+                frontier.append((neighbour, distance + 1))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_database(path=DEFAULT_PATH, build_missing=True):
+    """Memory-map the table at path, building it first if it does not exist."""
+    global _table
+    if _table is not None and path == DEFAULT_PATH:
+        return _table
+    if not os.path.exists(path):
+        if not build_missing:
+            raise FileNotFoundError(path)
+        build_database(path)
+    with open(path, "rb") as f:
+        table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != STATE_COUNT:
+        raise ValueError(f"{path} is not an 8-puzzle state database")
+    if path == DEFAULT_PATH:
+        _table = table
+    return table
+
+
+def distance(state, table=None):
+    """Optimal number of moves from state to goal, or None if unsolvable."""
+    if table is None:
+        table = load_database()
+    d = table[rank(state)]
+    return None if d == UNREACHABLE else d
+
+
+def Lookup(start, table=None):
+    """Optimal path from start to goal read straight from the table.
+
+    Returns (path, expanded, cost, depth) where path is the list of states
+    from start to goal (None if start is unsolvable) and expanded is the
+    number of table probes.
+    """
+    if table is None:
+        table = load_database()
+    d = table[rank(start)]
+    if d == UNREACHABLE:
+        return None, 1, None, 0
+
+    expanded = 1
+    v = pack(start)
+    path = [list(start)]
+    while d > 0:
+        for neighbour in neighbours(v):
+            state = unpack(neighbour)
+            expanded += 1
+            if table[rank(state)] == d - 1:
+                v = neighbour
+                path.append(state)
+                d -= 1
+                break
+    return path, expanded, len(path) - 1, len(path) - 1
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "build":
+        out = build_database(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH)
+        print(f"Wrote {STATE_COUNT} entries to {out}")
+    else:
+        print("usage: python state_database.py build [path]")
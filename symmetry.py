@@ -0,0 +1,130 @@
+"""
+Transpose symmetry of square boards.
+
+The goal keeps the blank in the top-left corner, so reflecting a board in
+its main diagonal -- moving every cell to its mirror position and renaming
+every tile after the mirror of its own goal position -- maps the goal to
+itself and every move to a move. A state and its transpose therefore have
+mirrored optimal solutions, and only one of the two has to be searched: the
+canonical one, which is the smaller of the two as a list.
+
+A_Star and BFS solve the canonical state and hand back a parent map that
+answers in terms of the original board; SolutionCache stores one entry per
+symmetry class. A non-square board has no such mirror image, so it is its
+own canonical state.
+
+    python symmetry.py check      # solve non-square boards through the symmetric paths
+"""
+
+from collections.abc import Mapping
+from functools import lru_cache
+
+from board import dimensions
+
+
+@lru_cache(maxsize=None)
+def _mirror(cols):
+    # _mirror(cols)[p] = position of p reflected in the main diagonal
+    return tuple((p % cols) * cols + p // cols for p in range(cols * cols))
+
+
+def transpose(state):
+    """The mirror image of a square board, as a list."""
+    cols, rows = dimensions(state)
+    if cols != rows:
+        raise ValueError(f"Only square boards can be transposed, not {cols}x{rows}")
+    mirror = _mirror(cols)
+    result = [0] * len(state)
+    for p, tile in enumerate(state):
+        result[mirror[p]] = mirror[tile]
+    return result
+
+
+def canonical(state):
+    """Return (representative, mirrored): the canonical member of state's class
+    and whether it is the transpose of state rather than state itself."""
+    state = list(state)
+    cols, rows = dimensions(state)
+    if cols != rows:
+        return state, False
+    mirrored = transpose(state)
+    if mirrored < state:
+        return mirrored, True
+    return state, False
+
+
+def transpose_path(path):
+    return [type(state)(transpose(state)) for state in path]
+
+
+_TRANSPOSED_MOVES = str.maketrans("UDLR", "LRUD")
+
+
+def transpose_moves(moves):
+    """The move string of the transposed path: up and left swap, as do down and right."""
+    return moves.translate(_TRANSPOSED_MOVES)
+
+
+class TransposedMap(Mapping):
+    """Parent map of a mirrored search, read back in terms of the original board.
+
+    parents maps states of the transposed search to their parents (as
+    PackedMap does); keys and values are transposed on the way in and out.
+    """
+
+    def __init__(self, parents):
+        self._parents = parents
+
+    def __getitem__(self, key):
+        value = self._parents[tuple(transpose(key))]
+        if value is None:
+            return None
+        return type(value)(transpose(value))
+
+    def __contains__(self, key):
+        return tuple(transpose(key)) in self._parents
+
+    def __iter__(self):
+        for key in self._parents:
+            yield tuple(transpose(key))
+
+    def __len__(self):
+        return len(self._parents)
+
+    def moves_to(self, state):
+        return transpose_moves(self._parents.moves_to(transpose(state)))
+
+
+def check():
+    """Solve 2x3 and 3x4 boards with BFS, A_Star and the solution cache, all
+    of which canonicalize; returns the number of boards that failed."""
+    import contextlib
+    import io
+    from A_star import A_Star, manhattan_distance
+    from BFS import BFS
+    from solution_cache import SolutionCache
+    from solve import solve
+
+    boards = [[1, 0, 2, 3, 4, 5], [2, 1, 3, 5, 0, 4], [1, 4, 2, 7, 0, 5, 3, 6, 8, 9, 10, 11]]
+    cache = SolutionCache()
+    failures = 0
+    for start in boards:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                costs = {BFS(start)[2], A_Star(start, manhattan_distance)[2],
+                         len(solve(start, "astar", cache=cache)[0]) - 1,
+                         len(solve(start, "astar", cache=cache)[0]) - 1}
+            if canonical(start) != (start, False) or len(costs) != 1:
+                raise ValueError(f"costs {costs}")
+            print(f"{start}: {costs.pop()} moves")
+        except Exception as e:
+            failures += 1
+            print(f"{start}: {type(e).__name__}: {e}")
+    return failures
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["check"]:
+        sys.exit(1 if check() else 0)
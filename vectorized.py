@@ -0,0 +1,243 @@
+"""
+Layer-at-a-time search with NumPy.
+
+The other solvers expand one state at a time in Python. Here a whole
+frontier is an (n, cells) uint8 array: the children of every state are made
+with one fancy-indexed blank swap per move slot, heuristics come from a
+per-tile lookup table, and duplicates are removed on uint64 keys (4 bits per
+tile, position 0 most significant) with np.unique and searchsorted against
+sorted arrays of the states already seen.
+
+Vectorized_BFS searches level by level and only checks new states against
+the two previous levels. Vectorized_A_Star pops every state with the lowest
+(f, h) at once and expands them as one batch.
+
+Both return (Parent, expanded, cost, depth) like BFS and A_Star, with Parent
+holding only the states on the solution path. numpy is only needed by this
+module; boards of up to 16 cells (8- and 15-puzzle) are supported.
+"""
+
+import numpy as np
+
+from A_star import manhattan_distance, tile_table
+from board import adjacent, dimensions, goal_state
+from packed_state import PackedMap, board_for
+
+PROGRESS_INTERVAL = 1000  # expansions between progress(expanded, frontier, depth) calls
+
+
+class _Layout:
+    """Move table and key weights for one board size."""
+
+    def __init__(self, cols, rows):
+        self.cells = cols * rows
+        if self.cells > 16:
+            raise ValueError("vectorized search supports boards of up to 16 cells")
+        # targets[blank] = positions the blank can move to, padded with -1
+        self.targets = np.full((self.cells, 4), -1, dtype=np.intp)
+        for blank, targets in enumerate(adjacent(cols, rows)):
+            self.targets[blank, :len(targets)] = targets
+        self.shifts = np.array([4 * (self.cells - 1 - i) for i in range(self.cells)], dtype=np.uint64)
+
+    def pack(self, states):
+        return (states.astype(np.uint64) << self.shifts).sum(axis=1, dtype=np.uint64)
+
+    def unpack(self, keys):
+        return ((keys[:, None] >> self.shifts) & np.uint64(15)).astype(np.uint8)
+
+    def expand(self, states):
+        """Children of every row of states, as (children, parent row, tile, source, dest).
+
+        The children of one state are consecutive, in the usual move order;
+        tile slid from source into the blank at dest."""
+        blanks = (states == 0).argmax(axis=1)
+        targets = self.targets[blanks]
+        parent, slot = np.nonzero(targets >= 0)
+        source = targets[parent, slot]
+        dest = blanks[parent]
+        children = states[parent]
+        index = np.arange(len(children))
+        tiles = children[index, source]
+        children[index, dest] = tiles
+        children[index, source] = 0
+        return children, parent, tiles, source, dest
+
+
+def heuristic_values(states, table):
+    """Sum of table[tile][position] over each row of states (e.g. Manhattan distances)."""
+    return table[states, np.arange(states.shape[1])].sum(axis=1)
+
+
+def _contains(sorted_keys, keys):
+    # Boolean mask of keys that occur in the sorted array sorted_keys
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    index = np.searchsorted(sorted_keys, keys)
+    index[index == len(sorted_keys)] = 0
+    return sorted_keys[index] == keys
+
+
+class _SortedSet:
+    """Keys with a value each, held as sorted runs that are merged as they grow
+    (like a binary counter), so adding a batch never re-sorts everything."""
+
+    def __init__(self):
+        self.runs = []  # [(keys, values)], sorted by keys, larger runs first
+
+    def add(self, keys, values):
+        order = np.argsort(keys, kind="stable")
+        self.runs.append((keys[order], values[order]))
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            (k1, v1), (k2, v2) = self.runs.pop(), self.runs.pop()
+            keys, values = np.concatenate((k2, k1)), np.concatenate((v2, v1))
+            order = np.argsort(keys, kind="stable")
+            self.runs.append((keys[order], values[order]))
+
+    def contains(self, keys):
+        mask = np.zeros(len(keys), dtype=bool)
+        for run, _ in self.runs:
+            mask |= _contains(run, keys)
+        return mask
+
+    def get(self, key):
+        for run, values in self.runs:
+            index = np.searchsorted(run, key)
+            if index < len(run) and run[index] == key:
+                return values[index]
+        raise KeyError(key)
+
+    def __len__(self):
+        return sum(len(run) for run, _ in self.runs)
+
+
+def _path_map(packed, layout, keys):
+    # PackedMap {state: parent} over the path keys[0] (start) ... keys[-1] (goal)
+    states = layout.unpack(np.array(keys, dtype=np.uint64)).tolist()
+    Parent = {packed.pack(states[0]): None}
+    for parent, state in zip(states, states[1:]):
+        Parent[packed.pack(state)] = packed.pack(parent)
+    return PackedMap(Parent, board=packed)
+
+
+def Vectorized_BFS(start, progress=None):
+    """Breadth-first search expanding one whole level per step.
+
+    expanded counts the states of the levels expanded before the one holding
+    the goal, since the goal is found when its level is built.
+    """
+    cols, rows = dimensions(start)
+    layout = _Layout(cols, rows)
+    packed = board_for(start)
+    target = layout.pack(np.array([goal_state(cols, rows)], dtype=np.uint8))[0]
+
+    # levels[d] = sorted keys of the states d moves from start;
+    # parents[d][i] = index in levels[d - 1] of the parent of levels[d][i]
+    levels = [layout.pack(np.array([start], dtype=np.uint8))]
+    parents = [None]
+    expanded = 0
+    while len(levels[-1]):
+        depth = len(levels) - 1
+        frontier = levels[-1]
+        found = np.nonzero(frontier == target)[0]
+        if len(found):
+            index = int(found[0])
+            path = []
+            for d in range(depth, -1, -1):
+                path.append(levels[d][index])
+                if d:
+                    index = parents[d][index]
+            print("Reach Goal")
+            return _path_map(packed, layout, path[::-1]), expanded, depth, depth
+        previous = expanded
+        expanded += len(frontier)
+        if progress is not None and expanded // PROGRESS_INTERVAL > previous // PROGRESS_INTERVAL:
+            progress(expanded, len(frontier), depth)
+
+        children, parent, _, _, _ = layout.expand(layout.unpack(frontier))
+        keys, first = np.unique(layout.pack(children), return_index=True)
+        parent = parent[first]
+        # Every move flips the parity of the blank's row + column, so no two
+        # states on one level are adjacent: a child is new or on the level before
+        keep = ~_contains(levels[-2] if depth else frontier, keys)
+        levels.append(keys[keep])
+        parents.append(parent[keep])
+
+    print("No solution found !!!!!!!!!!!!!!!!")
+
+
+def Vectorized_A_Star(start, heuristic=manhattan_distance, progress=None):
+    """A* that pops all states with the lowest (f, h) together and expands them
+    as one batch. heuristic must be a sum of per-tile terms (see tile_table);
+    like A_Star, states are closed when popped, which assumes it is consistent.
+    """
+    cols, rows = dimensions(start)
+    layout = _Layout(cols, rows)
+    packed = board_for(start)
+    goal = goal_state(cols, rows)
+    table = tile_table(heuristic, goal)
+    if table is None:
+        raise ValueError("vectorized A* needs a heuristic with a tile_distance")
+    table = np.array(table)
+    target = layout.pack(np.array([goal], dtype=np.uint8))[0]
+
+    start_states = np.array([start], dtype=np.uint8)
+    h_start = heuristic_values(start_states, table)[0].item()
+    # (f, h, g) -> list of (keys, parent keys)
+    open_buckets = {(h_start, h_start, 0): [(layout.pack(start_states), np.zeros(1, dtype=np.uint64))]}
+    open_size = 1
+    closed = _SortedSet()  # key -> parent key
+    expanded = search_depth = 0
+    while open_buckets:
+        f, h, g = min(open_buckets)
+        chunks = open_buckets.pop((f, h, g))
+        keys = np.concatenate([c[0] for c in chunks])
+        parent_keys = np.concatenate([c[1] for c in chunks])
+        open_size -= len(keys)
+        keys, first = np.unique(keys, return_index=True)
+        parent_keys = parent_keys[first]
+        fresh = ~closed.contains(keys)
+        keys, parent_keys = keys[fresh], parent_keys[fresh]
+        if not len(keys):
+            continue
+        closed.add(keys, parent_keys)
+        previous = expanded
+        expanded += len(keys)
+        search_depth = max(search_depth, g)
+        if target in keys:
+            path = [target]
+            while len(path) <= g:
+                path.append(closed.get(path[-1]))
+            print("reach goal")
+            return _path_map(packed, layout, path[::-1]), expanded, g, search_depth
+        if progress is not None and expanded // PROGRESS_INTERVAL > previous // PROGRESS_INTERVAL:
+            progress(expanded, open_size, search_depth)
+
+        children, parent, tiles, source, dest = layout.expand(layout.unpack(keys))
+        child_keys = layout.pack(children)
+        new = ~closed.contains(child_keys)
+        child_keys, parent, tiles, source, dest = (
+            child_keys[new], parent[new], tiles[new], source[new], dest[new])
+        child_h = h + table[tiles, dest] - table[tiles, source]
+        child_parents = keys[parent]
+        for child in np.unique(child_h):
+            mask = child_h == child
+            child = child.item()
+            open_buckets.setdefault((g + 1 + child, child, g + 1), []).append(
+                (child_keys[mask], child_parents[mask]))
+        open_size += len(child_keys)
+
+    print ("No Solution Found !!!!!!!!!!!!! ")
+
+
+if __name__ == "__main__":
+    import time
+    from A_star import printPath
+
+    start = [8, 7, 6, 0, 4, 1, 2, 5, 3]
+    for name, search in (("BFS", Vectorized_BFS), ("A*", Vectorized_A_Star)):
+        start_time = time.time()
+        Parent, expanded, cost, depth = search(start)
+        elapsed = time.time() - start_time
+        print(f"{name}: cost of path: {cost}, Nodes expanded: {expanded}, Search depth: {depth}, "
+              f"Execution time: {elapsed:.4f} seconds")
+    printPath(Parent, goal_state(3, 3))